@@ -5,7 +5,14 @@ Sippy AI Agent - A LangChain Re-Act agent for CI analysis.
 __version__ = "0.1.0"
 __author__ = "Sippy Team"
 
-from .agent import SippyAgent
 from .config import Config
 
 __all__ = ["SippyAgent", "Config"]
+
+
+def __getattr__(name):
+    # Import the agent, and with it LangChain, only when it's first used
+    if name == "SippyAgent":
+        from .agent import SippyAgent
+        return SippyAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
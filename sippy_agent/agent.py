@@ -16,8 +16,6 @@ from langchain.schema import AgentAction, AgentFinish, LLMResult
 from .config import Config
 from .tools import (
     ExampleTool,
-    SippyJobAnalysisTool,
-    SippyTestFailureTool,
     SippyProwJobSummaryTool,
     SippyLogAnalyzerTool,
     SippyJiraIncidentTool,
@@ -31,6 +29,9 @@ from .tools import (
 
 logger = logging.getLogger(__name__)
 
+# Start of the response returned when chat() fails
+CHAT_ERROR_PREFIX = "I encountered an error while processing your request"
+
 
 class StreamingThinkingHandler(BaseCallbackHandler):
     """Callback handler to stream thinking process in real-time."""
@@ -167,7 +168,6 @@ class SippyAgent:
         self.llm = self._create_llm()
         self.tools = self._create_tools()
         self.agent_executor = self._create_agent_executor()
-        self.token_counter = TokenCountingHandler()
     
     def _create_llm(self) -> Union[ChatOpenAI, ChatGoogleGenerativeAI]:
         """Create the language model instance."""
@@ -223,8 +223,6 @@ class SippyAgent:
         """Create the list of tools available to the agent."""
         tools = [
             ExampleTool(),
-            SippyJobAnalysisTool(),
-            SippyTestFailureTool(),
             SippyProwJobSummaryTool(sippy_api_url=self.config.sippy_api_url),
             SippyLogAnalyzerTool(sippy_api_url=self.config.sippy_api_url),
             SippyJiraIncidentTool(
@@ -233,7 +231,7 @@ class SippyAgent:
                 jira_token=self.config.jira_token
             ),
             SippyReleasePayloadTool(),
-            SippyPayloadDetailsTool(),
+            SippyPayloadDetailsTool(sippy_api_url=self.config.sippy_api_url),
             SippyReleasesTool(sippy_api_url=self.config.sippy_api_url),
             JUnitParserTool(),
             AggregatedJobAnalyzerTool(sippy_api_url=self.config.sippy_api_url),
@@ -594,13 +592,14 @@ New input: {input}
             chat_history: Previous conversation context
             thinking_callback: Optional callback for streaming thoughts (thought, action, input, observation)
         """
+        show_thinking = self.config.thinking_enabled()
         try:
-            # Reset token counter for this conversation
-            self.token_counter.reset()
+            # Count tokens per call; the web server runs several chats concurrently
+            token_counter = TokenCountingHandler()
 
             # Set up callbacks for streaming thinking and token counting
-            callbacks = [self.token_counter]
-            if self.config.show_thinking and thinking_callback:
+            callbacks = [token_counter]
+            if show_thinking and thinking_callback:
                 streaming_handler = StreamingThinkingHandler(thinking_callback)
                 callbacks.append(streaming_handler)
 
@@ -610,7 +609,7 @@ New input: {input}
             }, config={"callbacks": callbacks})
 
             # Get token usage summary
-            token_usage = self.token_counter.get_summary()
+            token_usage = token_counter.get_summary()
 
             # Log token usage
             if token_usage['total_tokens'] > 0:
@@ -622,7 +621,7 @@ New input: {input}
                 elif token_usage['total_tokens'] > 50000:  # 50K tokens
                     logger.info(f"Moderate token usage: {token_usage['total_tokens']} tokens")
 
-            if self.config.show_thinking:
+            if show_thinking:
                 # Parse the intermediate steps to extract thinking process
                 thinking_steps = self._parse_thinking_steps(result)
 
@@ -651,8 +650,8 @@ New input: {input}
                     return result["output"]
         except Exception as e:
             logger.error(f"Error processing message: {e}")
-            error_msg = f"I encountered an error while processing your request: {str(e)}"
-            if self.config.show_thinking:
+            error_msg = f"{CHAT_ERROR_PREFIX}: {str(e)}"
+            if show_thinking:
                 return {
                     "output": error_msg,
                     "thinking_steps": []
@@ -668,7 +667,7 @@ New input: {input}
         intermediate_steps = result.get("intermediate_steps", [])
 
         # Always log when thinking is enabled (not just verbose)
-        if self.config.show_thinking:
+        if self.config.thinking_enabled():
             logger.info(f"Parsing thinking: Found {len(intermediate_steps)} intermediate steps")
             logger.info(f"Available result keys: {list(result.keys())}")
 
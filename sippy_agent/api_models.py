@@ -17,7 +17,12 @@ class ChatRequest(BaseModel):
     """Request model for chat endpoint."""
     message: str
     chat_history: Optional[List[ChatMessage]] = None
+    # Pre-formatted history context; used instead of chat_history when set
+    chat_history_context: Optional[str] = None
     show_thinking: Optional[bool] = None
+    # Allow an identical earlier request's answer to be reused. Off by
+    # default since CI data changes and the agent may reach a new answer.
+    cacheable: bool = False
 
 
 class ThinkingStep(BaseModel):
@@ -3,13 +3,19 @@ Configuration management for Sippy Agent.
 """
 
 import os
-from typing import Optional
+from contextvars import ContextVar
+from typing import List, Optional
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Per-request override of Config.show_thinking. The web server sets this for
+# each request instead of mutating the shared config, so concurrent requests
+# with different settings don't clobber each other.
+SHOW_THINKING: ContextVar[Optional[bool]] = ContextVar("show_thinking", default=None)
+
 
 class Config(BaseModel):
     """Configuration settings for the Sippy Agent."""
@@ -62,6 +68,14 @@ class Config(BaseModel):
         description="Jira API token for authentication (optional for public queries)"
     )
     
+    # Web Server Configuration
+    cors_origins: List[str] = Field(
+        default_factory=lambda: [
+            origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()
+        ],
+        description="Origins allowed to call the web API (comma-separated CORS_ORIGINS, '*' allows any)"
+    )
+
     # Agent Configuration
     max_iterations: int = Field(
         default=15,
@@ -100,6 +114,11 @@ class Config(BaseModel):
         """Check if the model is a Gemini model."""
         return self.model_name.startswith("gemini")
 
+    def thinking_enabled(self) -> bool:
+        """Check if thinking output is enabled for the current request."""
+        override = SHOW_THINKING.get()
+        return self.show_thinking if override is None else override
+
     def validate_required_settings(self) -> None:
         """Validate that required settings are present."""
         # Only require OpenAI API key if using OpenAI's endpoint
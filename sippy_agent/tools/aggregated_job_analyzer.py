@@ -9,6 +9,7 @@ from pydantic import Field
 import httpx
 
 from .base_tool import SippyBaseTool, SippyToolInput
+from .job_helpers import clean_job_id
 
 logger = logging.getLogger(__name__)
 
@@ -37,12 +38,8 @@ class AggregatedJobAnalyzerTool(SippyBaseTool):
             return "Error: No Sippy API URL configured. Please set SIPPY_API_URL environment variable or provide sippy_api_url parameter."
         
         # Clean and validate the job ID
-        clean_job_id = str(prow_job_run_id).strip()
-        import re
-        job_id_match = re.search(r'\b(\d{10,})\b', clean_job_id)
-        if job_id_match:
-            clean_job_id = job_id_match.group(1)
-        elif not clean_job_id.isdigit():
+        job_id = clean_job_id(prow_job_run_id)
+        if not job_id:
             return f"Error: Invalid job ID format. Expected numeric ID, got: {prow_job_run_id}"
         
         # Construct the API endpoint for aggregated JUnit artifacts
@@ -51,7 +48,7 @@ class AggregatedJobAnalyzerTool(SippyBaseTool):
         try:
             # Make the API request specifically for junit-aggregated.xml
             params = {
-                "prowJobRuns": clean_job_id,
+                "prowJobRuns": job_id,
                 "pathGlob": "artifacts/**/junit-aggregated.xml"
             }
             
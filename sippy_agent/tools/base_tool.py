@@ -5,16 +5,25 @@ Base classes and interfaces for Sippy Agent tools.
 import json
 import logging
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Type, ClassVar
-from pydantic import BaseModel, Field
+from typing import Any, ClassVar, Dict, Optional, Tuple, Type
+from pydantic import BaseModel, ConfigDict, Field
+from langchain.callbacks.manager import AsyncCallbackManager, CallbackManager
 from langchain.tools import BaseTool
 
 logger = logging.getLogger(__name__)
 
+# LangChain-specific kwargs that tools don't need
+_LANGCHAIN_PARAMS = {
+    'verbose', 'callbacks', 'tags', 'metadata', 'run_name',
+    'color', 'llm_prefix', 'observation_prefix', 'return_intermediate_steps'
+}
+
 
 class SippyToolInput(BaseModel):
     """Base input schema for Sippy tools."""
-    pass
+
+    # Tool inputs are validated once per call and never mutated
+    model_config = ConfigDict(frozen=True)
 
 
 class SippyBaseTool(BaseTool, ABC):
@@ -62,32 +71,70 @@ class SippyBaseTool(BaseTool, ABC):
 
         return result
 
+    def _callback_manager_args(self, args: tuple, kwargs: Dict[str, Any],
+                               filtered_kwargs: Dict[str, Any]) -> Tuple[tuple, str, Dict[str, Any]]:
+        """Arguments for CallbackManager.configure and for on_tool_start."""
+        tool_input = str(args[0]) if args else str(filtered_kwargs)
+        configure_args = (
+            kwargs.get('callbacks'), self.callbacks, self.verbose or bool(kwargs.get('verbose')),
+            kwargs.get('tags'), self.tags, kwargs.get('metadata'), self.metadata
+        )
+        # Passed through so handlers like StdOutCallbackHandler can format the run
+        event_kwargs = {k: kwargs[k] for k in ('color', 'llm_prefix', 'observation_prefix') if k in kwargs}
+        return configure_args, tool_input, event_kwargs
+
     def run(self, *args, **kwargs) -> str:
         """Override run to add output size limiting."""
+        # Filter out LangChain-specific kwargs that tools don't need
+        filtered_kwargs = {k: v for k, v in kwargs.items() if k not in _LANGCHAIN_PARAMS}
+
+        # Open a tool run so callback handlers (e.g. the thinking stream) see
+        # on_tool_start/on_tool_end; the AgentExecutor passes its handlers in kwargs
+        configure_args, tool_input, event_kwargs = self._callback_manager_args(args, kwargs, filtered_kwargs)
+        run_manager = CallbackManager.configure(*configure_args).on_tool_start(
+            {"name": self.name, "description": self.description},
+            tool_input,
+            name=kwargs.get('run_name'),
+            **event_kwargs
+        )
         try:
-            # Filter out LangChain-specific kwargs that tools don't need
-            langchain_params = {
-                'verbose', 'callbacks', 'tags', 'metadata', 'run_name',
-                'color', 'llm_prefix', 'observation_prefix', 'return_intermediate_steps'
-            }
-            filtered_kwargs = {k: v for k, v in kwargs.items() if k not in langchain_params}
-
             # Call the original _run method with filtered kwargs
             result = self._run(*args, **filtered_kwargs)
             # Apply size limiting
-            return self._truncate_output_if_needed(result)
+            output = self._truncate_output_if_needed(result)
+        except Exception as e:
+            logger.error(f"Error in tool {self.name}: {e}")
+            output = f"Error in {self.name}: {str(e)}"
+        run_manager.on_tool_end(output, name=self.name, **event_kwargs)
+        return output
+
+    async def arun(self, *args, **kwargs) -> str:
+        """Override arun to add output size limiting."""
+        filtered_kwargs = {k: v for k, v in kwargs.items() if k not in _LANGCHAIN_PARAMS}
+        configure_args, tool_input, event_kwargs = self._callback_manager_args(args, kwargs, filtered_kwargs)
+        run_manager = await AsyncCallbackManager.configure(*configure_args).on_tool_start(
+            {"name": self.name, "description": self.description},
+            tool_input,
+            name=kwargs.get('run_name'),
+            **event_kwargs
+        )
+        try:
+            result = await self._arun(*args, **filtered_kwargs)
+            output = self._truncate_output_if_needed(result)
         except Exception as e:
             logger.error(f"Error in tool {self.name}: {e}")
-            return f"Error in {self.name}: {str(e)}"
+            output = f"Error in {self.name}: {str(e)}"
+        await run_manager.on_tool_end(output, name=self.name, **event_kwargs)
+        return output
 
     @abstractmethod
     def _run(self, **kwargs: Any) -> str:
         """Execute the tool with the given arguments."""
         pass
 
-    async def _arun(self, **kwargs: Any) -> str:
+    async def _arun(self, *args: Any, **kwargs: Any) -> str:
         """Async version of _run. Default implementation calls _run."""
-        return self._run(**kwargs)
+        return self._run(*args, **kwargs)
 
 
 class ExampleTool(SippyBaseTool):
@@ -0,0 +1,132 @@
+"""
+Shared HTTP clients for Sippy Agent tools.
+"""
+
+import asyncio
+import atexit
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+# Retry connection failures (e.g. transient TCP resets) before giving up
+HTTP_RETRIES = 2
+
+# Clients shared by all tools - initialized lazily. An AsyncClient's
+# connections belong to the event loop that opened them, so keep one per loop
+_client: Optional[httpx.Client] = None
+# Tools run in worker threads, so creating the sync client must be serialized
+_client_lock = threading.Lock()
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+
+# Fail fast on connect and pool waits; reads get the usual 30s
+_TIMEOUT = httpx.Timeout(connect=5.0, read=30.0, write=10.0, pool=5.0)
+
+
+def _limits() -> httpx.Limits:
+    """Connection pool limits shared by the sync and async clients."""
+    return httpx.Limits(max_keepalive_connections=20, max_connections=40, keepalive_expiry=30.0)
+
+
+def get_client() -> httpx.Client:
+    """Get or create the shared HTTP client.
+
+    Reusing one client keeps connections (and their resolved addresses and
+    TLS sessions) alive between tool calls instead of paying for DNS, TCP and
+    TLS setup on every request.
+    """
+    global _client
+    client = _client
+    if client is None or client.is_closed:
+        with _client_lock:
+            client = _client
+            if client is None or client.is_closed:
+                client = _client = httpx.Client(
+                    transport=httpx.HTTPTransport(retries=HTTP_RETRIES, http2=True, limits=_limits()),
+                    timeout=_TIMEOUT
+                )
+    return client
+
+
+@atexit.register
+def _close_client() -> None:
+    """Close the shared HTTP client at interpreter exit."""
+    if _client is not None:
+        _client.close()
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Get or create the async HTTP client for the running event loop.
+
+    Must be called from a coroutine. The client is dropped along with its
+    loop; close it explicitly with aclose_async_client() on shutdown.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(retries=HTTP_RETRIES, http2=True, limits=_limits()),
+            timeout=_TIMEOUT
+        )
+        _async_clients[loop] = client
+    return client
+
+
+async def aclose_async_client() -> None:
+    """Close the running event loop's async HTTP client, if one was created."""
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+class ETagCache:
+    """Remembers the last ETag and decoded body per URL for conditional GETs.
+
+    Send the stored ETag as If-None-Match; on a 304 Not Modified reply the
+    cached body can be reused without transferring or parsing it again.
+    With a ttl, entries younger than ttl seconds are served without any
+    request at all.
+    """
+
+    def __init__(self, maxsize: int = 128, ttl: float = 0.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Optional[str], Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def lookup(self, url: str) -> Optional[Tuple[Optional[str], Any, float]]:
+        """Return the cached (etag, data, expires_at) entry for a URL, if any."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is not None:
+                self._entries.move_to_end(url)
+            return entry
+
+    def fresh(self, entry: Optional[Tuple[Optional[str], Any, float]]) -> bool:
+        """Whether an entry is still within its ttl and can skip revalidation."""
+        return entry is not None and time.monotonic() < entry[2]
+
+    def store(self, url: str, response: httpx.Response, data: Any) -> None:
+        """Cache decoded data under the response's ETag."""
+        etag = response.headers.get("ETag")
+        if not etag and not self.ttl:
+            return
+        with self._lock:
+            self._entries[url] = (etag, data, time.monotonic() + self.ttl)
+            self._entries.move_to_end(url)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def refresh(self, url: str, entry: Tuple[Optional[str], Any, float]) -> None:
+        """Restart the ttl of an entry the server confirmed is not modified."""
+        with self._lock:
+            self._entries[url] = (entry[0], entry[1], time.monotonic() + self.ttl)
+
+
+def conditional_headers(entry: Optional[Tuple[Optional[str], Any, float]]) -> Dict[str, str]:
+    """Build If-None-Match headers for a cached ETagCache entry."""
+    return {"If-None-Match": entry[0]} if entry and entry[0] else {}
@@ -0,0 +1,214 @@
+"""
+Helper functions for working with Sippy prow job runs and their summaries.
+"""
+
+import re
+from collections import defaultdict
+from datetime import datetime
+from itertools import islice
+from typing import Any, Dict, Optional
+
+from .test_analysis_helpers import analyze_test_failures, extract_test_category, clean_failure_message
+
+# Prow job run IDs are long numeric strings, possibly embedded in other text
+_JOB_ID_RE = re.compile(r'\b(\d{10,})\b')
+
+
+def clean_job_id(prow_job_run_id: Any) -> Optional[str]:
+    """Extract the numeric prow job run ID from the input, or None if there isn't one."""
+    job_id = str(prow_job_run_id).strip()
+    if job_id.isdigit():
+        return job_id
+    job_id_match = _JOB_ID_RE.search(job_id)
+    return job_id_match.group(1) if job_id_match else None
+
+
+def format_job_summary(data: Dict[str, Any]) -> str:
+    """Format a Sippy job run summary for display."""
+    if not data:
+        return "No data returned from Sippy API"
+
+    # Extract main fields
+    job_id = data.get("id", "Unknown")
+    job_name = data.get("name", "Unknown")
+    release = data.get("release", "Unknown")
+    cluster = data.get("cluster", "Unknown")
+    start_time = data.get("startTime", "")
+    duration_seconds = data.get("durationSeconds", 0)
+    overall_result = data.get("overallResult", "Unknown")
+    reason = data.get("reason", "Unknown")
+    succeeded = data.get("succeeded", False)
+    failed = data.get("failed", False)
+    infrastructure_failure = data.get("infrastructureFailure", False)
+    known_failure = data.get("knownFailure", False)
+    test_count = data.get("testCount", 0)
+    test_failure_count = data.get("testFailureCount", 0)
+    variants = data.get("variants", [])
+    url = data.get("url", "")
+    testgrid_url = data.get("testGridURL", "")
+
+    # Legacy fields for backward compatibility
+    test_failures = data.get("testFailures", {})
+    degraded_operators = data.get("degradedOperators", {})
+
+    # Build formatted response
+    parts = [f"**Prow Job Summary**\n\n"]
+    parts.append(f"**Job ID:** {job_id}\n")
+    parts.append(f"**Job Name:** {job_name}\n")
+    parts.append(f"**Release:** {release}\n")
+    parts.append(f"**Cluster:** {cluster}\n\n")
+
+    # Check if this is an aggregated job and provide basic information
+    if job_name and job_name.startswith("aggregated-"):
+        parts.append(f"🔄 **AGGREGATED JOB DETECTED**\n")
+        parts.append(f"This is a statistical aggregation job that runs multiple instances (typically 10) of the same test.\n")
+        parts.append(f"The test failures shown below are from the aggregated results.\n\n")
+
+    # Format timing information
+    parts.append(f"**⏱️ Timing & Duration:**\n")
+    if start_time:
+        # Parse and format the start time
+        formatted_start = format_timestamp(start_time)
+        parts.append(f"Start Time: {formatted_start}\n")
+
+    if duration_seconds > 0:
+        formatted_duration = format_duration(duration_seconds)
+        parts.append(f"Duration: {formatted_duration} ({duration_seconds:,} seconds)\n")
+    else:
+        parts.append(f"Duration: Not available\n")
+    parts.append("\n")
+
+    # Format results
+    parts.append(f"**📊 Results:**\n")
+    parts.append(f"Overall Result: {overall_result}\n")
+    parts.append(f"Succeeded: {'✅ Yes' if succeeded else '❌ No'}\n")
+    parts.append(f"Failed: {'❌ Yes' if failed else '✅ No'}\n")
+    parts.append(f"Infrastructure Failure: {'🚨 Yes' if infrastructure_failure else '✅ No'}\n")
+    parts.append(f"Known Failure: {'⚠️ Yes' if known_failure else '✅ No'}\n")
+    parts.append(f"Reason: {reason}\n\n")
+
+    # Format test information
+    parts.append(f"**🧪 Test Information:**\n")
+    parts.append(f"Total Tests: {test_count}\n")
+    parts.append(f"Failed Tests: {test_failure_count}\n")
+    if test_failure_count > 0 and test_count > 0:
+        failure_rate = (test_failure_count / test_count) * 100
+        parts.append(f"Failure Rate: {failure_rate:.1f}%\n")
+    parts.append("\n")
+
+    # Format variants
+    if variants:
+        parts.append(f"**🔧 Configuration Variants:**\n")
+        # Group variants by type
+        variant_groups = defaultdict(list)
+        for variant in variants:
+            key, sep, value = variant.partition(':')
+            if sep:
+                variant_groups[key].append(value)
+            else:
+                variant_groups['Other'].append(variant)
+
+        for key, values in variant_groups.items():
+            parts.append(f"{key}: {', '.join(values)}\n")
+        parts.append("\n")
+
+    # Format legacy test failures if present (limit to 25 to control token usage)
+    if test_failures:
+        total_failures = len(test_failures)
+        max_failures_to_show = 25
+
+        parts.append(f"**❌ Failed Tests Details ({total_failures} total")
+        if total_failures > max_failures_to_show:
+            parts.append(f", showing first {max_failures_to_show}")
+        parts.append("):**\n")
+
+        # Analyze test failure patterns (use all failures for analysis)
+        test_analysis = analyze_test_failures(test_failures)
+        if test_analysis:
+            parts.append(f"\n**🔍 Test Failure Analysis:**\n{test_analysis}\n")
+
+        parts.append(f"\n**📋 Individual Test Failures:**\n")
+
+        # Limit the number of individual failures displayed
+        failures_to_show = islice(test_failures.items(), max_failures_to_show)
+
+        for i, (test_name, failure_msg) in enumerate(failures_to_show, 1):
+            # Extract test category from test name
+            test_category = extract_test_category(test_name)
+
+            # Truncate very long failure messages but keep key error info
+            clean_msg = clean_failure_message(failure_msg)
+
+            parts.append(f"{i}. **{test_name}**\n")
+            if test_category:
+                parts.append(f"   Category: {test_category}\n")
+            parts.append(f"   Error: {clean_msg}\n\n")
+
+        # Add note if there are more failures
+        if total_failures > max_failures_to_show:
+            remaining = total_failures - max_failures_to_show
+            parts.append(f"... and {remaining} more failed tests (use log analysis tools for detailed investigation)\n\n")
+
+    # Format degraded operators if present (limit to 10 to control token usage)
+    if degraded_operators:
+        total_operators = len(degraded_operators)
+        max_operators_to_show = 10
+
+        parts.append(f"**⚠️ Degraded Operators ({total_operators} total")
+        if total_operators > max_operators_to_show:
+            parts.append(f", showing first {max_operators_to_show}")
+        parts.append("):**\n")
+
+        # Limit the number of operators displayed
+        operators_to_show = islice(degraded_operators.items(), max_operators_to_show)
+
+        for i, (operator_name, operator_info) in enumerate(operators_to_show, 1):
+            parts.append(f"{i}. **{operator_name}**\n")
+            if isinstance(operator_info, str):
+                parts.append(f"   Info: {operator_info}\n")
+            else:
+                parts.append(f"   Info: {str(operator_info)}\n")
+            parts.append("\n")
+
+        # Add note if there are more operators
+        if total_operators > max_operators_to_show:
+            remaining = total_operators - max_operators_to_show
+            parts.append(f"... and {remaining} more degraded operators\n\n")
+
+    # Add useful links
+    parts.append(f"**🔗 Links:**\n")
+    if url:
+        parts.append(f"**Prow Job URL:** {url}\n")
+        parts.append(f"[View Job in Prow]({url})\n")
+    if testgrid_url:
+        parts.append(f"**TestGrid URL:** {testgrid_url}\n")
+        parts.append(f"[View in TestGrid]({testgrid_url})\n")
+
+    return "".join(parts)
+
+
+def format_timestamp(timestamp: str) -> str:
+    """Format timestamp to a more readable format."""
+    try:
+        # fromisoformat handles offsets like "2025-06-16T22:09:31-04:00" and a trailing Z
+        return datetime.fromisoformat(timestamp).strftime('%Y-%m-%d %H:%M:%S UTC')
+    except Exception:
+        return timestamp
+
+
+def format_duration(seconds: int) -> str:
+    """Format duration in seconds to a human-readable format."""
+    if seconds < 60:
+        return f"{seconds}s"
+    elif seconds < 3600:
+        minutes = seconds // 60
+        remaining_seconds = seconds % 60
+        return f"{minutes}m {remaining_seconds}s"
+    else:
+        hours = seconds // 3600
+        remaining_minutes = (seconds % 3600) // 60
+        remaining_seconds = seconds % 60
+        if remaining_seconds > 0:
+            return f"{hours}h {remaining_minutes}m {remaining_seconds}s"
+        else:
+            return f"{hours}h {remaining_minutes}m"
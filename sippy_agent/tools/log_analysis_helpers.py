@@ -2,8 +2,11 @@
 Helper functions for analyzing log patterns and errors.
 """
 
+import re
 from typing import Any, Dict, List
 
+_STEP_RE = re.compile(r'step ([a-zA-Z0-9-_]+)')
+
 
 def analyze_error_patterns(matches: list) -> str:
     """Analyze error patterns and provide insights."""
@@ -88,8 +91,7 @@ def analyze_error_patterns(matches: list) -> str:
             error_text = error.get("match", "")
             if "step " in error_text.lower():
                 # Extract step name
-                import re
-                step_match = re.search(r'step ([a-zA-Z0-9-_]+)', error_text.lower())
+                step_match = _STEP_RE.search(error_text.lower())
                 if step_match:
                     failed_steps.add(step_match.group(1))
         
@@ -2,23 +2,43 @@
 Tool for getting detailed OpenShift release payload information from the release controller API.
 """
 
-import json
+import asyncio
 import logging
 import re
-from typing import Any, Dict, List, Optional, Type
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Type
 from pydantic import Field
 import httpx
+import orjson
 
 from .base_tool import SippyBaseTool, SippyToolInput
+from .http_helpers import ETagCache, conditional_headers, get_async_client, get_client
+from .job_helpers import format_job_summary
+from .payload_helpers import clean_payload_name, extract_release_stream, get_status_emoji
 
 logger = logging.getLogger(__name__)
 
+_PROW_ID_RE = re.compile(r'/(\d{10,})/?$')
+
+# Upper bound on concurrent job summary requests to avoid hammering the Sippy API
+_MAX_CONCURRENT_PREFETCH = 8
+
+# Last ETag and decoded body per payload URL, for conditional GETs
+_etag_cache = ETagCache()
+
+
+def _parse_flag(value: Any) -> bool:
+    """Interpret a JSON input flag; the agent sometimes sends booleans as strings."""
+    if isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes")
+    return bool(value)
+
 
 class SippyPayloadDetailsTool(SippyBaseTool):
     """Tool for getting detailed OpenShift release payload information."""
     
     name: str = "get_payload_details"
-    description: str = "Get comprehensive information for a specific OpenShift release payload including changelog details (component updates, rebuilt images, updated images with pull requests PRs), failed blocking jobs with clickable links to Prow jobs, GitHub PRs, commits, and Jira issues. Shows which jobs failed but does NOT automatically suggest log analysis. Use this ONLY when user asks for details about a specific payload. For basic payload status, use get_release_payloads first. Input: payload name (e.g., '4.20.0-0.nightly-2025-06-17-061341')"
+    description: str = "Get comprehensive information for a specific OpenShift release payload including changelog details (component updates, rebuilt images, updated images with pull requests PRs), failed blocking jobs with clickable links to Prow jobs, GitHub PRs, commits, and Jira issues. Shows which jobs failed but does NOT automatically suggest log analysis. Use this ONLY when user asks for details about a specific payload. For basic payload status, use get_release_payloads first. Input: payload name (e.g., '4.20.0-0.nightly-2025-06-17-061341'). To also get summaries of the failed blocking jobs in the same call, pass a JSON object instead: {\"payload_name\": \"4.20.0-0.nightly-2025-06-17-061341\", \"prefetch_job_summaries\": true, \"max_jobs_to_analyze\": 3}"
 
     # Release controller API base URL
     release_controller_url: str = Field(
@@ -34,24 +54,104 @@ class SippyPayloadDetailsTool(SippyBaseTool):
     
     class PayloadDetailsInput(SippyToolInput):
         payload_name: str = Field(description="Full payload name (e.g., '4.20.0-0.nightly-2025-06-17-061341')")
-        include_job_analysis: Optional[bool] = Field(
+        include_job_analysis: bool = Field(
             default=False,
             description="Include suggested next steps for analyzing failed blocking jobs"
         )
-        max_jobs_to_analyze: Optional[int] = Field(
+        max_jobs_to_analyze: int = Field(
             default=5,
             description="Maximum number of failed jobs to analyze in detail (defaults to 5 to avoid excessive API calls)"
         )
+        prefetch_job_summaries: bool = Field(
+            default=False,
+            description="Fetch job summaries for up to max_jobs_to_analyze failed blocking jobs concurrently and include them in the result"
+        )
     
     args_schema: Type[SippyToolInput] = PayloadDetailsInput
     
     def _run(
         self,
         payload_name: str,
-        include_job_analysis: Optional[bool] = False,
-        max_jobs_to_analyze: Optional[int] = 5
+        include_job_analysis: bool = False,
+        max_jobs_to_analyze: int = 5,
+        prefetch_job_summaries: bool = False
     ) -> str:
         """Get detailed payload information from the release controller API."""
+        request, error = self._prepare_request(payload_name, include_job_analysis, max_jobs_to_analyze, prefetch_job_summaries)
+        if error:
+            return error
+        clean_payload_name, release_stream, endpoint, include_job_analysis, max_jobs_to_analyze, prefetch_job_summaries = request
+
+        data, error = self._get_json(endpoint, clean_payload_name, release_stream)
+        if error:
+            return error
+
+        try:
+            job_summaries = None
+            if prefetch_job_summaries:
+                job_summaries = self._fetch_job_summaries(self._get_failed_jobs(data), max_jobs_to_analyze)
+
+            # Format the response
+            return self._format_payload_details(data, clean_payload_name, include_job_analysis, max_jobs_to_analyze, job_summaries)
+            
+        except Exception as e:
+            return self._handle_error(e, clean_payload_name, release_stream)
+
+    async def _arun(
+        self,
+        payload_name: str,
+        include_job_analysis: bool = False,
+        max_jobs_to_analyze: int = 5,
+        prefetch_job_summaries: bool = False
+    ) -> str:
+        """Async version of _run using the shared async HTTP client."""
+        request, error = self._prepare_request(payload_name, include_job_analysis, max_jobs_to_analyze, prefetch_job_summaries)
+        if error:
+            return error
+        clean_payload_name, release_stream, endpoint, include_job_analysis, max_jobs_to_analyze, prefetch_job_summaries = request
+
+        data, error = await self._aget_json(endpoint, clean_payload_name, release_stream)
+        if error:
+            return error
+
+        try:
+            job_summaries = None
+            if prefetch_job_summaries:
+                job_summaries = await self._afetch_job_summaries(self._get_failed_jobs(data), max_jobs_to_analyze)
+
+            return self._format_payload_details(data, clean_payload_name, include_job_analysis, max_jobs_to_analyze, job_summaries)
+
+        except Exception as e:
+            return self._handle_error(e, clean_payload_name, release_stream)
+
+    def _prepare_request(
+        self,
+        payload_name: str,
+        include_job_analysis: bool,
+        max_jobs_to_analyze: int,
+        prefetch_job_summaries: bool
+    ) -> Tuple[Optional[Tuple[str, str, str, bool, int, bool]], Optional[str]]:
+        """Validate the tool input shared by _run and _arun, returning (request, error).
+
+        The request is (payload_name, release_stream, endpoint, include_job_analysis,
+        max_jobs_to_analyze, prefetch_job_summaries).
+        """
+        # The ReAct agent passes a single string; accept a JSON object for the optional parameters
+        payload_name = payload_name.strip()
+        if payload_name.startswith('{') and payload_name.endswith('}'):
+            try:
+                parsed = orjson.loads(payload_name)
+            except orjson.JSONDecodeError:
+                return None, f"Error: Received malformed JSON input: {payload_name}"
+            if not isinstance(parsed, dict) or 'payload_name' not in parsed:
+                return None, f"Error: JSON input must include payload_name, got: {payload_name}"
+            payload_name = str(parsed['payload_name'])
+            include_job_analysis = _parse_flag(parsed.get('include_job_analysis', include_job_analysis))
+            prefetch_job_summaries = _parse_flag(parsed.get('prefetch_job_summaries', prefetch_job_summaries))
+            try:
+                max_jobs_to_analyze = int(parsed.get('max_jobs_to_analyze', max_jobs_to_analyze))
+            except (TypeError, ValueError):
+                return None, f"Error: max_jobs_to_analyze must be a number, got: {parsed.get('max_jobs_to_analyze')}"
 
         # Clean the payload name in case it includes parameter syntax
         clean_payload_name = self._clean_payload_name(payload_name)
@@ -59,88 +159,207 @@ class SippyPayloadDetailsTool(SippyBaseTool):
         # Extract release stream from payload name
         release_stream = self._extract_release_stream(clean_payload_name)
         if not release_stream:
-            return f"Error: Could not extract release stream from payload name '{clean_payload_name}'. Expected format like '4.20.0-0.nightly-2025-06-17-061341'"
-        
-        # Construct the API endpoint for payload details
-        endpoint = f"{self.release_controller_url.rstrip('/')}/releasestream/{release_stream}/release/{clean_payload_name}"
-        
+            return None, f"Error: Could not extract release stream from payload name '{clean_payload_name}'. Expected format like '4.20.0-0.nightly-2025-06-17-061341'"
+
+        endpoint = self._payload_endpoint(release_stream, clean_payload_name)
+        return (
+            clean_payload_name, release_stream, endpoint,
+            include_job_analysis, max(0, max_jobs_to_analyze), prefetch_job_summaries
+        ), None
+
+    def _payload_endpoint(self, release_stream: str, payload_name: str) -> str:
+        """Build the release controller endpoint for a single payload."""
+        return f"{self.release_controller_url.rstrip('/')}/releasestream/{release_stream}/release/{payload_name}"
+
+    def _get_json(
+        self,
+        endpoint: str,
+        payload_name: str,
+        release_stream: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Fetch and decode a payload from the release controller, returning (data, error)."""
         try:
             logger.info(f"Making request to {endpoint}")
+            cached = _etag_cache.lookup(endpoint)
+            response = get_client().get(endpoint, headers=conditional_headers(cached))
+            return self._read_response(endpoint, response, cached)
+        except Exception as e:
+            return None, self._handle_error(e, payload_name, release_stream)
 
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(endpoint)
-                response.raise_for_status()
+    async def _aget_json(
+        self,
+        endpoint: str,
+        payload_name: str,
+        release_stream: str
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Async version of _get_json."""
+        try:
+            logger.info(f"Making async request to {endpoint}")
+            cached = _etag_cache.lookup(endpoint)
+            response = await get_async_client().get(endpoint, headers=conditional_headers(cached))
+            return self._read_response(endpoint, response, cached)
+        except Exception as e:
+            return None, self._handle_error(e, payload_name, release_stream)
 
-                # Log response details for debugging
-                logger.debug(f"Response status: {response.status_code}")
-                logger.debug(f"Response content type: {response.headers.get('content-type', 'unknown')}")
+    def _read_response(
+        self,
+        endpoint: str,
+        response: httpx.Response,
+        cached: Optional[Tuple[Optional[str], Any, float]]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Return the payload data, reusing the cached copy on 304 Not Modified."""
+        if cached and response.status_code == 304:
+            return cached[1], None
+        response.raise_for_status()
+
+        data, error = self._parse_response(response)
+        if not error:
+            _etag_cache.store(endpoint, response, data)
+        return data, error
+
+    def _parse_response(self, response: httpx.Response) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Parse a payload details response, returning (data, error)."""
+        # Parse the body directly; only decode it as text if parsing fails
+        try:
+            data = orjson.loads(response.content)
+        except orjson.JSONDecodeError as json_err:
+            content_type = response.headers.get('content-type', 'unknown')
+            logger.error(f"JSON decode error: {json_err} (Content-Type: {content_type})")
+            logger.error(f"Response text: {response.text[:500]}...")
+            return None, f"Error: Invalid JSON response from API. Content-Type: {content_type}. Response: {response.text[:200]}..."
+
+        # Validate that data is a dictionary
+        if not isinstance(data, dict):
+            logger.error(f"Expected dict, got {type(data)}: {str(data)[:200]}...")
+            return None, f"Error: API returned unexpected data type {type(data)}. Expected JSON object."
 
-                # Check if response is JSON (be more lenient with content type checking)
-                content_type = response.headers.get('content-type', '')
-                if not (content_type.startswith('application/json') or content_type.startswith('text/json') or response.text.strip().startswith('{')):
-                    logger.warning(f"Unexpected content type: {content_type}")
-                    logger.warning(f"Response text: {response.text[:500]}...")
-                    return f"Error: API returned non-JSON response. Content-Type: {content_type}"
+        return data, None
 
-                try:
-                    data = response.json()
-                    logger.debug(f"JSON parsed successfully, type: {type(data)}")
-                except json.JSONDecodeError as json_err:
-                    logger.error(f"JSON decode error: {json_err}")
-                    logger.error(f"Response text: {response.text[:500]}...")
-                    return f"Error: Invalid JSON response from API. Response: {response.text[:200]}..."
-
-                # Validate that data is a dictionary
-                if not isinstance(data, dict):
-                    logger.error(f"Expected dict, got {type(data)}: {str(data)[:200]}...")
-                    return f"Error: API returned unexpected data type {type(data)}. Expected JSON object."
-
-                # Format the response
-                return self._format_payload_details(data, clean_payload_name, include_job_analysis, max_jobs_to_analyze)
-                
-        except httpx.HTTPStatusError as e:
+    def _handle_error(self, e: Exception, payload_name: str, release_stream: str) -> str:
+        """Convert an exception raised while fetching payload details into an error message."""
+        if isinstance(e, httpx.HTTPStatusError):
             logger.error(f"HTTP error getting payload details: {e}")
             if e.response.status_code == 404:
-                return f"Error: Payload '{clean_payload_name}' not found in release stream '{release_stream}'. Check if the payload name is correct."
+                return f"Error: Payload '{payload_name}' not found in release stream '{release_stream}'. Check if the payload name is correct."
             return f"Error: HTTP {e.response.status_code} - {e.response.text}"
-        except httpx.RequestError as e:
+        if isinstance(e, httpx.RequestError):
             logger.error(f"Request error getting payload details: {e}")
             return f"Error: Failed to connect to release controller API - {str(e)}"
-        except json.JSONDecodeError as e:
+        if isinstance(e, orjson.JSONDecodeError):
             logger.error(f"JSON decode error: {e}")
             return f"Error: Invalid JSON response from release controller API"
-        except Exception as e:
-            logger.error(f"Unexpected error getting payload details: {e}")
-            return f"Error: Unexpected error - {str(e)}"
+        logger.error(f"Unexpected error getting payload details: {e}")
+        return f"Error: Unexpected error - {str(e)}"
 
-    def _clean_payload_name(self, payload_name: str) -> str:
-        """Clean payload name from common parameter syntax issues."""
-        # Remove common parameter syntax patterns
-        cleaned = payload_name.strip()
-
-        # Handle cases like "payload name = '4.20.0-0.nightly-2025-06-17-061341'"
-        if '=' in cleaned:
-            cleaned = cleaned.split('=')[-1].strip()
+    def _get_failed_jobs(self, data: Dict[str, Any]) -> List[Tuple[str, Optional[str], str]]:
+        """Collect (job_name, prow_job_id, url) for every failed blocking job."""
+        failed_jobs = []
+        blocking_jobs = data.get("results", {}).get("blockingJobs", {})
+        for job_name, job_info in blocking_jobs.items():
+            if not isinstance(job_info, dict):
+                continue
+            state = job_info.get("state", "Unknown")
+            if state.lower() == "failed":
+                url = job_info.get("url", "")
+                prow_job_id = self._extract_prow_job_id(url)
+                failed_jobs.append((job_name, prow_job_id, url))
+        return failed_jobs
+
+    def _job_summary_endpoint(self) -> Optional[str]:
+        """Build the Sippy job summary endpoint, if a Sippy API URL is configured."""
+        if not self.sippy_api_url:
+            logger.warning("Cannot prefetch job summaries: no Sippy API URL configured")
+            return None
+        return f"{self.sippy_api_url.rstrip('/')}/api/job/run/summary"
 
-        # Remove quotes
-        cleaned = cleaned.strip('\'"')
+    def _format_prefetched_summary(self, job_id: str, response: httpx.Response) -> str:
+        """Format a prefetched job summary response."""
+        try:
+            response.raise_for_status()
+            return format_job_summary(orjson.loads(response.content))
+        except Exception as e:
+            return self._prefetch_error(job_id, e)
+
+    def _prefetch_error(self, job_id: str, e: Exception) -> str:
+        """Describe a failed job summary prefetch; one bad job doesn't fail the whole report."""
+        if isinstance(e, httpx.HTTPStatusError):
+            logger.error(f"HTTP error prefetching job summary for {job_id}: {e}")
+            return f"Error: Failed to fetch summary for job {job_id} - HTTP {e.response.status_code}"
+        if isinstance(e, httpx.RequestError):
+            logger.error(f"Request error prefetching job summary for {job_id}: {e}")
+            return f"Error: Failed to connect to Sippy API for job {job_id} - {str(e)}"
+        if isinstance(e, orjson.JSONDecodeError):
+            logger.error(f"JSON decode error prefetching job summary for {job_id}: {e}")
+            return f"Error: Invalid JSON response from Sippy API for job {job_id}"
+        logger.error(f"Unexpected error prefetching job summary for {job_id}: {e}")
+        return f"Error: Failed to summarize job {job_id} - {str(e)}"
+
+    def _fetch_job_summaries(
+        self,
+        failed_jobs: List[Tuple[str, Optional[str], str]],
+        max_jobs: int
+    ) -> Dict[str, str]:
+        """Fetch job summaries for failed jobs concurrently, keyed by job ID."""
+        endpoint = self._job_summary_endpoint()
+        job_ids = [job_id for _, job_id, _ in failed_jobs if job_id][:max(0, max_jobs)]
+        if not endpoint or not job_ids:
+            return {}
+
+        client = get_client()
+
+        def fetch(job_id: str) -> str:
+            try:
+                response = client.get(endpoint, params={"prow_job_run_id": job_id})
+            except Exception as e:
+                return self._prefetch_error(job_id, e)
+            return self._format_prefetched_summary(job_id, response)
+
+        logger.info(f"Prefetching {len(job_ids)} job summaries from {endpoint}")
+        with ThreadPoolExecutor(max_workers=min(_MAX_CONCURRENT_PREFETCH, len(job_ids))) as executor:
+            return dict(zip(job_ids, executor.map(fetch, job_ids)))
+
+    async def _afetch_job_summaries(
+        self,
+        failed_jobs: List[Tuple[str, Optional[str], str]],
+        max_jobs: int
+    ) -> Dict[str, str]:
+        """Async version of _fetch_job_summaries using the shared async HTTP client."""
+        endpoint = self._job_summary_endpoint()
+        job_ids = [job_id for _, job_id, _ in failed_jobs if job_id][:max(0, max_jobs)]
+        if not endpoint or not job_ids:
+            return {}
+
+        client = get_async_client()
+        semaphore = asyncio.Semaphore(_MAX_CONCURRENT_PREFETCH)
+
+        async def fetch(job_id: str) -> str:
+            async with semaphore:
+                try:
+                    response = await client.get(endpoint, params={"prow_job_run_id": job_id})
+                except Exception as e:
+                    return self._prefetch_error(job_id, e)
+            return self._format_prefetched_summary(job_id, response)
 
-        # Extract just the payload name pattern
-        payload_pattern = re.search(r'(\d+\.\d+\.0-0\.(nightly|ci)-\d{4}-\d{2}-\d{2}-\d{6})', cleaned)
-        if payload_pattern:
-            return payload_pattern.group(1)
+        logger.info(f"Prefetching {len(job_ids)} job summaries from {endpoint}")
+        summaries = await asyncio.gather(*(fetch(job_id) for job_id in job_ids))
+        return dict(zip(job_ids, summaries))
 
-        return cleaned
+    def _clean_payload_name(self, payload_name: str) -> str:
+        """Clean payload name from common parameter syntax issues."""
+        return clean_payload_name(payload_name)
 
     def _extract_release_stream(self, payload_name: str) -> Optional[str]:
         """Extract release stream from payload name."""
-        # Expected format: 4.20.0-0.nightly-2025-06-17-061341
-        match = re.match(r'^(\d+\.\d+\.0-0\.(nightly|ci))-\d{4}-\d{2}-\d{2}-\d{6}$', payload_name)
-        if match:
-            return match.group(1)
-        return None
+        return extract_release_stream(payload_name)
 
-    def _format_payload_details(self, data: Dict[str, Any], payload_name: str, include_job_analysis: bool, max_jobs_to_analyze: int = 5) -> str:
+    def _format_payload_details(
+        self,
+        data: Dict[str, Any],
+        payload_name: str,
+        include_job_analysis: bool,
+        max_jobs_to_analyze: int = 5,
+        job_summaries: Optional[Dict[str, str]] = None
+    ) -> str:
         """Format the detailed payload response data for display."""
         if not data:
             return "No data returned from release controller API"
@@ -164,52 +383,50 @@ class SippyPayloadDetailsTool(SippyBaseTool):
 
         try:
             # Build comprehensive formatted response
-            result = f"**Payload Analysis: {name}**\n\n"
-            result += f"**Status:** {self._get_status_emoji(phase)} {phase}\n\n"
+            parts = [f"**Payload Analysis: {name}**\n\n"]
+            parts.append(f"**Status:** {self._get_status_emoji(phase)} {phase}\n\n")
 
             # Analyze blocking jobs FIRST if payload was rejected/failed
             blocking_jobs = results.get("blockingJobs", {})
             if blocking_jobs:
-                failed_jobs = []
-                for job_name, job_info in blocking_jobs.items():
-                    if not isinstance(job_info, dict):
-                        continue
-                    state = job_info.get("state", "Unknown")
-                    if state.lower() == "failed":
-                        url = job_info.get("url", "")
-                        prow_job_id = self._extract_prow_job_id(url)
-                        failed_jobs.append((job_name, prow_job_id, url))
+                failed_jobs = self._get_failed_jobs(data)
 
                 # Summary
                 total_blocking = len(blocking_jobs)
                 failed_count = len(failed_jobs)
-                result += f"**Summary:** {failed_count} out of {total_blocking} blocking jobs failed\n\n"
+                parts.append(f"**Summary:** {failed_count} out of {total_blocking} blocking jobs failed\n\n")
 
                 if failed_jobs:
-                    result += f"**Failed Blocking Jobs:**\n"
+                    parts.append(f"**Failed Blocking Jobs:**\n")
                     for job_name, prow_job_id, url in failed_jobs:
-                        result += f"• **{job_name}**"
+                        parts.append(f"• **{job_name}**")
                         if url:
-                            result += f" ([View Job]({url}))"
+                            parts.append(f" ([View Job]({url}))")
                         elif prow_job_id:
                             # Construct prow URL if not provided by API
                             constructed_url = f"https://prow.ci.openshift.org/view/gs/test-platform-results/logs/{prow_job_id}"
-                            result += f" ([View Job]({constructed_url}))"
-                        result += "\n"
+                            parts.append(f" ([View Job]({constructed_url}))")
+                        parts.append("\n")
                         if prow_job_id:
-                            result += f"  Job ID: `{prow_job_id}`\n"
-                        result += "\n"
+                            parts.append(f"  Job ID: `{prow_job_id}`\n")
+                        parts.append("\n")
 
                     # Include analysis suggestions for failed jobs only if requested
                     if include_job_analysis:
                         failed_jobs_dict = {job[0]: {"url": job[2]} for job in failed_jobs}
-                        result += self._suggest_job_analysis(failed_jobs_dict, max_jobs_to_analyze)
+                        parts.append(self._suggest_job_analysis(failed_jobs_dict, max_jobs_to_analyze))
+
+                    # Include prefetched job summaries so the agent doesn't need a follow-up call per job
+                    if job_summaries:
+                        parts.append(f"**Failed Job Summaries ({len(job_summaries)} prefetched):**\n\n")
+                        for summary in job_summaries.values():
+                            parts.append(f"{summary}\n\n")
 
             # Add changelog information if available (after blocking jobs)
             if change_log_json:
-                result += self._format_changelog(change_log_json)
+                parts.append(self._format_changelog(change_log_json))
 
-            return result
+            return "".join(parts)
 
         except Exception as e:
             logger.error(f"Error formatting payload details: {e}")
@@ -218,15 +435,7 @@ class SippyPayloadDetailsTool(SippyBaseTool):
 
     def _get_status_emoji(self, status: str) -> str:
         """Get emoji for status."""
-        status_emojis = {
-            "accepted": "✅",
-            "rejected": "❌",
-            "failed": "💥",
-            "ready": "🔄",
-            "pending": "⏳",
-            "running": "🏃"
-        }
-        return status_emojis.get(status.lower(), "❓")
+        return get_status_emoji(status)
 
     def _extract_prow_job_id(self, url: str) -> Optional[str]:
         """Extract prow job ID from URL."""
@@ -234,7 +443,7 @@ class SippyPayloadDetailsTool(SippyBaseTool):
             return None
         
         # URL format: https://prow.ci.openshift.org/view/gs/test-platform-results/logs/.../1934869209162977280
-        match = re.search(r'/(\d{10,})/?$', url)
+        match = _PROW_ID_RE.search(url)
         if match:
             return match.group(1)
         return None
@@ -250,13 +459,13 @@ class SippyPayloadDetailsTool(SippyBaseTool):
 
         if prow_job_ids:
             jobs_to_analyze = min(max_jobs, len(prow_job_ids))
-            result = f"**Next Steps:** Analyze {jobs_to_analyze} key failed jobs:\n"
+            parts = [f"**Next Steps:** Analyze {jobs_to_analyze} key failed jobs:\n"]
 
             for i, (job_name, job_id) in enumerate(prow_job_ids[:jobs_to_analyze], 1):
-                result += f"{i}. Job ID `{job_id}` ({job_name.split('-')[-1]})\n"
+                parts.append(f"{i}. Job ID `{job_id}` ({job_name.split('-')[-1]})\n")
 
-            result += f"\nFor each job: get_prow_job_summary → analyze_job_logs → look for patterns\n"
-            return result
+            parts.append(f"\nFor each job: get_prow_job_summary → analyze_job_logs → look for patterns\n")
+            return "".join(parts)
 
         return ""
 
@@ -265,29 +474,29 @@ class SippyPayloadDetailsTool(SippyBaseTool):
         if not change_log_json:
             return ""
 
-        result = "**📋 Changelog Information**\n\n"
+        parts = ["**📋 Changelog Information**\n\n"]
 
         # Component updates
         components = change_log_json.get("components", [])
         if components:
-            result += f"**🔧 Component Updates ({len(components)}):**\n"
+            parts.append(f"**🔧 Component Updates ({len(components)}):**\n")
             for component in components:
                 name = component.get("name", "Unknown")
                 version = component.get("version", "Unknown")
                 from_version = component.get("from", "")
 
-                result += f"• **{name}:** {version}"
+                parts.append(f"• **{name}:** {version}")
                 if from_version and from_version != version:
-                    result += f" (from {from_version})"
-                result += "\n"
-            result += "\n"
+                    parts.append(f" (from {from_version})")
+                parts.append("\n")
+            parts.append("\n")
 
 
 
         # Pull Requests from updated images
         updated_images = change_log_json.get("updatedImages", [])
         if updated_images:
-            result += f"**📦 Pull Requests ({len(updated_images)} repositories):**\n"
+            parts.append(f"**📦 Pull Requests ({len(updated_images)} repositories):**\n")
             # Show all repositories - let the global 150kB guard handle truncation
             for image in updated_images:
                 name = image.get("name", "Unknown")
@@ -303,7 +512,7 @@ class SippyPayloadDetailsTool(SippyBaseTool):
                     repo_base_url = repo_parts
                     repo_name = repo_parts.split("/")[-1] if "/" in repo_parts else name
 
-                result += f"• **{name}** ({repo_name})\n"
+                parts.append(f"• **{name}** ({repo_name})\n")
 
                 # Show key commits/PRs with links
                 for commit in commits[:3]:  # Limit to first 3 commits per image
@@ -312,15 +521,15 @@ class SippyPayloadDetailsTool(SippyBaseTool):
                     pull_url = commit.get("pullURL", "")
                     issues = commit.get("issues", {})
 
-                    result += f"  - {subject}"
+                    parts.append(f"  - {subject}")
                     if pull_id and pull_url:
-                        result += f" ([PR #{pull_id}]({pull_url}))"
+                        parts.append(f" ([PR #{pull_id}]({pull_url}))")
                     elif pull_id and repo_base_url:
                         # Construct PR URL if not provided
                         pr_url = f"{repo_base_url}/pull/{pull_id}"
-                        result += f" ([PR #{pull_id}]({pr_url}))"
+                        parts.append(f" ([PR #{pull_id}]({pr_url}))")
                     elif pull_id:
-                        result += f" (PR #{pull_id})"
+                        parts.append(f" (PR #{pull_id})")
 
                     if issues:
                         issue_links = []
@@ -329,16 +538,16 @@ class SippyPayloadDetailsTool(SippyBaseTool):
                                 issue_links.append(f"[{issue_key}]({issue_url})")
                             else:
                                 issue_links.append(issue_key)
-                        result += f" [{', '.join(issue_links)}]"
-                    result += "\n"
+                        parts.append(f" [{', '.join(issue_links)}]")
+                    parts.append("\n")
 
                 if len(commits) > 3:
-                    result += f"  - ... and {len(commits) - 3} more commits\n"
-                result += "\n"
+                    parts.append(f"  - ... and {len(commits) - 3} more commits\n")
+                parts.append("\n")
 
-            result += "\n"
+            parts.append("\n")
 
-        return result
+        return "".join(parts)
 
     def _format_timestamp(self, timestamp: str) -> str:
         """Format ISO timestamp to readable format."""
@@ -0,0 +1,54 @@
+"""
+Helper functions for working with OpenShift release payload names.
+"""
+
+import re
+from typing import Optional
+
+# Payload names look like 4.20.0-0.nightly-2025-06-17-061341
+_PAYLOAD_RE = re.compile(r'(\d+\.\d+\.0-0\.(?:nightly|ci)-\d{4}-\d{2}-\d{2}-\d{6})')
+_STREAM_RE = re.compile(r'^(\d+\.\d+\.0-0\.(?:nightly|ci))-\d{4}-\d{2}-\d{2}-\d{6}$')
+
+# Emoji shown next to each payload phase
+STATUS_EMOJI = {
+    "accepted": "✅",
+    "rejected": "❌",
+    "ready": "🔄",
+    "failed": "💥",
+    "pending": "⏳",
+    "running": "🏃"
+}
+
+
+def clean_payload_name(payload_name: str) -> str:
+    """Clean payload name from common parameter syntax issues."""
+    # Remove common parameter syntax patterns
+    cleaned = payload_name.strip()
+
+    # Handle cases like "payload name = '4.20.0-0.nightly-2025-06-17-061341'"
+    if '=' in cleaned:
+        cleaned = cleaned.split('=')[-1].strip()
+
+    # Remove quotes
+    cleaned = cleaned.strip('\'"')
+
+    # Extract just the payload name pattern
+    payload_pattern = _PAYLOAD_RE.search(cleaned)
+    if payload_pattern:
+        return payload_pattern.group(1)
+
+    return cleaned
+
+
+def extract_release_stream(payload_name: str) -> Optional[str]:
+    """Extract release stream from payload name."""
+    # Expected format: 4.20.0-0.nightly-2025-06-17-061341
+    match = _STREAM_RE.match(payload_name)
+    if match:
+        return match.group(1)
+    return None
+
+
+def get_status_emoji(status: str) -> str:
+    """Get emoji for payload status."""
+    return STATUS_EMOJI.get(status.lower(), "❓")
@@ -2,17 +2,45 @@
 Tool for getting OpenShift release payload information from the release controller API.
 """
 
-import json
 import logging
 import re
-from typing import Any, Dict, List, Optional, Type
+from collections import Counter
+from itertools import islice
+from typing import Any, Dict, List, Optional, Tuple, Type
 from pydantic import Field
 import httpx
+import orjson
 
 from .base_tool import SippyBaseTool, SippyToolInput
+from .http_helpers import ETagCache, conditional_headers, get_async_client, get_client
+from .payload_helpers import STATUS_EMOJI
 
 logger = logging.getLogger(__name__)
 
+_VERSION_CLEAN_RE = re.compile(r'[^\d.]')
+_VERSION_RE = re.compile(r'^\d+\.\d+$')
+_TIMESTAMP_RE = re.compile(r'(\d{4}-\d{2}-\d{2}-\d{6})')
+
+# Read size used when streaming /tags responses, which can run to hundreds of KB
+_CHUNK_SIZE = 65536
+
+# Last ETag and decoded body per /tags URL. The agent often asks about the same
+# stream several times within one answer, so skip revalidation for a few seconds
+_TAGS_TTL = 15.0
+_etag_cache = ETagCache(ttl=_TAGS_TTL)
+
+
+def _extract_timestamp(name: str) -> Optional[str]:
+    """Extract the YYYY-MM-DD-HHMMSS timestamp from a payload name."""
+    # Payload names end with the timestamp (4.20.0-0.nightly-2025-06-17-061341),
+    # so check the fixed-width suffix before falling back to a regex search
+    ts = name[-17:]
+    if (len(ts) == 17 and ts[4] == '-' and ts[7] == '-' and ts[10] == '-'
+            and ts[:4].isdigit() and ts[5:7].isdigit() and ts[8:10].isdigit() and ts[11:].isdigit()):
+        return ts
+    match = _TIMESTAMP_RE.search(name)
+    return match.group(1) if match else None
+
 
 class SippyReleasePayloadTool(SippyBaseTool):
     """Tool for getting OpenShift release payload information."""
@@ -32,11 +60,11 @@ class SippyReleasePayloadTool(SippyBaseTool):
             default="nightly",
             description="Stream type: 'nightly' or 'ci' (defaults to 'nightly')"
         )
-        include_ready: Optional[bool] = Field(
+        include_ready: bool = Field(
             default=False,
             description="Include 'Ready' phase payloads (defaults to False)"
         )
-        limit: Optional[int] = Field(
+        limit: int = Field(
             default=10,
             description="Maximum number of payloads to return (defaults to 10)"
         )
@@ -47,59 +75,143 @@ class SippyReleasePayloadTool(SippyBaseTool):
         self,
         release_version: str,
         stream_type: Optional[str] = "nightly",
-        include_ready: Optional[bool] = False,
-        limit: Optional[int] = 10
+        include_ready: bool = False,
+        limit: int = 10
     ) -> str:
         """Get release payload information from the release controller API."""
+        request, error = self._prepare_request(release_version, stream_type)
+        if error:
+            return error
+        clean_version, release_stream, endpoint = request
+        
+        try:
+            logger.info(f"Making request to {endpoint}")
+            
+            data = self._fetch_tags(endpoint)
+            
+            # Format the response
+            return self._format_payload_response(
+                data, 
+                release_version=clean_version,
+                stream_type=stream_type or "nightly",
+                include_ready=include_ready,
+                limit=limit
+            )
+            
+        except Exception as e:
+            return self._handle_error(e, release_stream)
+
+    async def _arun(
+        self,
+        release_version: str,
+        stream_type: Optional[str] = "nightly",
+        include_ready: bool = False,
+        limit: int = 10
+    ) -> str:
+        """Async version of _run using the shared async HTTP client."""
+        request, error = self._prepare_request(release_version, stream_type)
+        if error:
+            return error
+        clean_version, release_stream, endpoint = request
+
+        try:
+            logger.info(f"Making async request to {endpoint}")
+
+            data = await self._afetch_tags(endpoint)
+
+            return self._format_payload_response(
+                data,
+                release_version=clean_version,
+                stream_type=stream_type or "nightly",
+                include_ready=include_ready,
+                limit=limit
+            )
+
+        except Exception as e:
+            return self._handle_error(e, release_stream)
 
+    def _prepare_request(
+        self,
+        release_version: str,
+        stream_type: Optional[str]
+    ) -> Tuple[Optional[Tuple[str, str, str]], Optional[str]]:
+        """Validate the release version and stream type, returning (request, error).
+
+        The request is (clean_version, release_stream, endpoint).
+        """
         # Validate and clean inputs
         stream_type = stream_type or "nightly"
         if stream_type not in ["nightly", "ci"]:
-            return f"Error: Invalid stream type '{stream_type}'. Must be 'nightly' or 'ci'."
+            return None, f"Error: Invalid stream type '{stream_type}'. Must be 'nightly' or 'ci'."
         
         # Clean release version (remove any extra characters)
-        clean_version = re.sub(r'[^\d\.]', '', release_version)
-        if not re.match(r'^\d+\.\d+$', clean_version):
-            return f"Error: Invalid release version format. Expected format like '4.20', got: {release_version}"
+        clean_version = _VERSION_CLEAN_RE.sub('', release_version)
+        if not _VERSION_RE.match(clean_version):
+            return None, f"Error: Invalid release version format. Expected format like '4.20', got: {release_version}"
         
         # Construct the release stream name
         release_stream = f"{clean_version}.0-0.{stream_type}"
         
         # Construct the API endpoint
         endpoint = f"{self.release_controller_url.rstrip('/')}/releasestream/{release_stream}/tags"
-        
-        try:
-            logger.info(f"Making request to {endpoint}")
-            
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(endpoint)
-                response.raise_for_status()
-                
-                data = response.json()
-                
-                # Format the response
-                return self._format_payload_response(
-                    data, 
-                    release_version=clean_version,
-                    stream_type=stream_type,
-                    include_ready=include_ready,
-                    limit=limit
-                )
-                
-        except httpx.HTTPStatusError as e:
+        return (clean_version, release_stream, endpoint), None
+
+    def _fetch_tags(self, endpoint: str) -> Dict[str, Any]:
+        """Stream the /tags response into a single buffer and decode it."""
+        cached = _etag_cache.lookup(endpoint)
+        if _etag_cache.fresh(cached):
+            return cached[1]
+        with get_client().stream("GET", endpoint, headers=conditional_headers(cached)) as response:
+            if cached and response.status_code == 304:
+                _etag_cache.refresh(endpoint, cached)
+                return cached[1]
+            if response.is_error:
+                # Load the body so the error message can include it
+                response.read()
+            response.raise_for_status()
+
+            buf = bytearray()
+            for chunk in response.iter_bytes(_CHUNK_SIZE):
+                buf.extend(chunk)
+        data = orjson.loads(buf)
+        _etag_cache.store(endpoint, response, data)
+        return data
+
+    async def _afetch_tags(self, endpoint: str) -> Dict[str, Any]:
+        """Async version of _fetch_tags."""
+        cached = _etag_cache.lookup(endpoint)
+        if _etag_cache.fresh(cached):
+            return cached[1]
+        async with get_async_client().stream("GET", endpoint, headers=conditional_headers(cached)) as response:
+            if cached and response.status_code == 304:
+                _etag_cache.refresh(endpoint, cached)
+                return cached[1]
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+
+            buf = bytearray()
+            async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                buf.extend(chunk)
+        data = orjson.loads(buf)
+        _etag_cache.store(endpoint, response, data)
+        return data
+
+    def _handle_error(self, e: Exception, release_stream: str) -> str:
+        """Convert an exception raised while fetching payloads into an error message."""
+        if isinstance(e, httpx.HTTPStatusError):
             logger.error(f"HTTP error getting release payloads: {e}")
             if e.response.status_code == 404:
                 return f"Error: Release stream '{release_stream}' not found. Check if the release version and stream type are correct."
             return f"Error: HTTP {e.response.status_code} - {e.response.text}"
-        except httpx.RequestError as e:
+        if isinstance(e, httpx.RequestError):
             logger.error(f"Request error getting release payloads: {e}")
             return f"Error: Failed to connect to release controller API - {str(e)}"
-        except json.JSONDecodeError as e:
+        if isinstance(e, orjson.JSONDecodeError):
             logger.error(f"JSON decode error: {e}")
             return f"Error: Invalid JSON response from release controller API"
-        except Exception as e:
-            logger.error(f"Unexpected error getting release payloads: {e}")
-            return f"Error: Unexpected error - {str(e)}"
+        logger.error(f"Unexpected error getting release payloads: {e}")
+        return f"Error: Unexpected error - {str(e)}"
 
     def _format_payload_response(
         self, 
@@ -119,119 +231,99 @@ class SippyReleasePayloadTool(SippyBaseTool):
         if not tags:
             return f"No payloads found for release stream {release_stream_name}"
 
-        # Filter payloads based on include_ready flag
-        filtered_tags = []
-        for tag in tags:
-            phase = tag.get("phase", "").lower()
-            if include_ready or phase != "ready":
-                filtered_tags.append(tag)
-        
-        # Limit the number of results
-        if limit and limit > 0:
-            filtered_tags = filtered_tags[:limit]
+        # Pair each tag with its lower-cased phase once, then filter based on the
+        # include_ready flag, stopping once the limit is reached
+        phased = ((tag, tag.get("phase", "Unknown").lower()) for tag in tags)
+        filtered = (pair for pair in phased if include_ready or pair[1] != "ready")
+        filtered_tags = list(islice(filtered, limit if limit and limit > 0 else None))
 
         # Build formatted response
-        result = f"**OpenShift Release Payloads - {release_version} {stream_type.title()}**\n\n"
-        result += f"**Release Stream:** {release_stream_name}\n"
-        result += f"**Total Payloads:** {len(tags)} (showing {len(filtered_tags)})\n\n"
+        parts = [
+            f"**OpenShift Release Payloads - {release_version} {stream_type.title()}**\n\n",
+            f"**Release Stream:** {release_stream_name}\n",
+            f"**Total Payloads:** {len(tags)} (showing {len(filtered_tags)})\n\n",
+        ]
 
         if not filtered_tags:
-            result += "No payloads found matching the criteria.\n"
+            parts.append("No payloads found matching the criteria.\n")
             if not include_ready:
-                result += "Note: 'Ready' phase payloads are excluded by default. Use include_ready=True to see them.\n"
-            return result
+                parts.append("Note: 'Ready' phase payloads are excluded by default. Use include_ready=True to see them.\n")
+            return "".join(parts)
 
         # Find the most recent payload for quick answer
-        most_recent = filtered_tags[0] if filtered_tags else None
-        if most_recent:
-            phase = most_recent.get("phase", "Unknown")
-            name = most_recent.get("name", "Unknown")
-            result += f"**🎯 Latest {release_version} {stream_type} Payload:** {name}\n"
-            result += f"**Status:** {phase}\n\n"
-
-            # Add a clear answer format for direct questions
-            result += f"**Quick Answer:** The last {release_version} {stream_type} payload was {name} and it was {phase.lower()}.\n\n"
-
-        # List all payloads
-        result += f"**📋 Payload List:**\n"
-        for i, tag in enumerate(filtered_tags, 1):
+        most_recent, phase_lc = filtered_tags[0]
+        phase = most_recent.get("phase", "Unknown")
+        name = most_recent.get("name", "Unknown")
+        parts.append(f"**🎯 Latest {release_version} {stream_type} Payload:** {name}\n")
+        parts.append(f"**Status:** {phase}\n\n")
+
+        # Add a clear answer format for direct questions
+        parts.append(f"**Quick Answer:** The last {release_version} {stream_type} payload was {name} and it was {phase_lc}.\n\n")
+
+        # List all payloads, counting phases for the summary in the same pass
+        phase_counts = Counter()
+        parts.append(f"**📋 Payload List:**\n")
+        for i, (tag, phase_lc) in enumerate(filtered_tags, 1):
             name = tag.get("name", "Unknown")
             phase = tag.get("phase", "Unknown")
             pull_spec = tag.get("pullSpec", "")
             download_url = tag.get("downloadURL", "")
+            phase_counts[phase_lc] += 1
             
             # Extract timestamp from name if possible
-            timestamp_match = re.search(r'(\d{4}-\d{2}-\d{2}-\d{6})', name)
+            timestamp_raw = _extract_timestamp(name)
             timestamp_str = ""
-            if timestamp_match:
-                timestamp_raw = timestamp_match.group(1)
+            if timestamp_raw:
                 # Format as YYYY-MM-DD HH:MM:SS
-                if len(timestamp_raw) == 15:  # YYYY-MM-DD-HHMMSS
-                    formatted_time = f"{timestamp_raw[:4]}-{timestamp_raw[5:7]}-{timestamp_raw[8:10]} {timestamp_raw[11:13]}:{timestamp_raw[13:15]}:00"
-                    timestamp_str = f" ({formatted_time})"
+                formatted_time = f"{timestamp_raw[:4]}-{timestamp_raw[5:7]}-{timestamp_raw[8:10]} {timestamp_raw[11:13]}:{timestamp_raw[13:15]}:{timestamp_raw[15:17]}"
+                timestamp_str = f" ({formatted_time})"
 
             # Status emoji
-            status_emoji = {
-                "accepted": "✅",
-                "rejected": "❌", 
-                "ready": "🔄",
-                "failed": "💥"
-            }.get(phase.lower(), "❓")
-
-            result += f"{i}. **{name}**{timestamp_str}\n"
-            result += f"   Status: {status_emoji} {phase}\n"
+            status_emoji = STATUS_EMOJI.get(phase_lc, "❓")
+
+            parts.append(f"{i}. **{name}**{timestamp_str}\n")
+            parts.append(f"   Status: {status_emoji} {phase}\n")
             
             if pull_spec:
-                result += f"   Pull Spec: `{pull_spec}`\n"
+                parts.append(f"   Pull Spec: `{pull_spec}`\n")
             if download_url:
-                result += f"   [Download]({download_url})\n"
-            result += "\n"
+                parts.append(f"   [Download]({download_url})\n")
+            parts.append("\n")
 
         # Add summary statistics
-        phase_counts = {}
-        for tag in filtered_tags:
-            phase = tag.get("phase", "Unknown").lower()
-            phase_counts[phase] = phase_counts.get(phase, 0) + 1
-
         if phase_counts:
-            result += f"**📊 Status Summary:**\n"
+            parts.append(f"**📊 Status Summary:**\n")
             for phase, count in sorted(phase_counts.items()):
-                emoji = {
-                    "accepted": "✅",
-                    "rejected": "❌", 
-                    "ready": "🔄",
-                    "failed": "💥"
-                }.get(phase, "❓")
-                result += f"{emoji} {phase.title()}: {count}\n"
+                emoji = STATUS_EMOJI.get(phase, "❓")
+                parts.append(f"{emoji} {phase.title()}: {count}\n")
 
-        return result
+        return "".join(parts)
 
     def get_latest_payload(self, release_version: str, stream_type: str = "nightly") -> Optional[Dict[str, Any]]:
         """Helper method to get just the latest payload information."""
         try:
-            # Use the main _run method but parse the result differently
+            # Use the same request as _run but parse the result differently
             # This is a simplified version for programmatic access
-            clean_version = re.sub(r'[^\d\.]', '', release_version)
-            release_stream = f"{clean_version}.0-0.{stream_type}"
-            endpoint = f"{self.release_controller_url.rstrip('/')}/releasestream/{release_stream}/tags"
+            request, error = self._prepare_request(release_version, stream_type)
+            if error:
+                logger.error(f"Error getting latest payload: {error}")
+                return None
+            _, _, endpoint = request
+            
+            data = self._fetch_tags(endpoint)
+            
+            tags = data.get("tags", [])
+            if not tags:
+                return None
+            
+            # Find first non-Ready payload
+            for tag in tags:
+                if tag.get("phase", "").lower() != "ready":
+                    return tag
+            
+            # If all are Ready, return the first one
+            return tags[0] if tags else None
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(endpoint)
-                response.raise_for_status()
-                data = response.json()
-                
-                tags = data.get("tags", [])
-                if not tags:
-                    return None
-                
-                # Find first non-Ready payload
-                for tag in tags:
-                    if tag.get("phase", "").lower() != "ready":
-                        return tag
-                
-                # If all are Ready, return the first one
-                return tags[0] if tags else None
-                
         except Exception as e:
             logger.error(f"Error getting latest payload: {e}")
             return None
@@ -2,17 +2,22 @@
 Tool for analyzing job artifacts and logs from Sippy API.
 """
 
-import json
 import logging
-from typing import Any, Dict, Optional, Type
+from typing import Any, Dict, Optional, Tuple, Type
 from pydantic import Field
 import httpx
+import orjson
 
 from .base_tool import SippyBaseTool, SippyToolInput
+from .http_helpers import get_async_client, get_client
+from .job_helpers import clean_job_id
 from .log_analysis_helpers import format_log_analysis
 
 logger = logging.getLogger(__name__)
 
+# Read size used when streaming artifact search responses
+_CHUNK_SIZE = 65536
+
 
 class SippyLogAnalyzerTool(SippyBaseTool):
     """Tool for analyzing job artifacts and logs from Sippy API using the /api/jobs/artifacts endpoint."""
@@ -44,68 +49,124 @@ class SippyLogAnalyzerTool(SippyBaseTool):
              text_regex: str = "[Ee]rror|[Ff]ail",
              sippy_api_url: Optional[str] = None) -> str:
         """Fetch and analyze job artifacts from Sippy API."""
+        request, error = self._prepare_request(prow_job_run_id, path_glob, text_regex, sippy_api_url)
+        if error:
+            return error
+        api_url, endpoint, params, cache_key = request
+
+        try:
+            logger.info(f"Making request to {endpoint} with params: {params}")
+            
+            # Longer timeout for log analysis
+            with get_client().stream("GET", endpoint, params=params, timeout=60.0) as response:
+                if response.is_error:
+                    # Load the body so the error message can include it
+                    response.read()
+                response.raise_for_status()
+
+                # Artifact matches can run to several MB, so collect the body into
+                # a single buffer rather than keeping the response's own copy too
+                buf = bytearray()
+                for chunk in response.iter_bytes(_CHUNK_SIZE):
+                    buf.extend(chunk)
+
+            return self._format_result(buf, params, cache_key)
+            
+        except Exception as e:
+            return self._handle_error(e, api_url)
+
+    async def _arun(self, prow_job_run_id: str, path_glob: str = "*build-log*",
+                    text_regex: str = "[Ee]rror|[Ff]ail",
+                    sippy_api_url: Optional[str] = None) -> str:
+        """Async version of _run using the shared async HTTP client."""
+        request, error = self._prepare_request(prow_job_run_id, path_glob, text_regex, sippy_api_url)
+        if error:
+            return error
+        api_url, endpoint, params, cache_key = request
+
+        try:
+            logger.info(f"Making async request to {endpoint} with params: {params}")
+
+            async with get_async_client().stream("GET", endpoint, params=params, timeout=60.0) as response:
+                if response.is_error:
+                    await response.aread()
+                response.raise_for_status()
+
+                buf = bytearray()
+                async for chunk in response.aiter_bytes(_CHUNK_SIZE):
+                    buf.extend(chunk)
+
+            return self._format_result(buf, params, cache_key)
+
+        except Exception as e:
+            return self._handle_error(e, api_url)
+
+    def _prepare_request(
+        self,
+        prow_job_run_id: str,
+        path_glob: str,
+        text_regex: str,
+        sippy_api_url: Optional[str]
+    ) -> Tuple[Optional[Tuple[str, str, Dict[str, str], str]], Optional[str]]:
+        """Validate the tool input shared by _run and _arun, returning (request, early_result).
+
+        The request is (api_url, endpoint, params, cache_key). The early result is an
+        error message, or the cached result when this search has already been run.
+        """
         # Use provided URL or fall back to instance URL
         api_url = sippy_api_url or self.sippy_api_url
 
         if not api_url:
-            return "Error: No Sippy API URL configured. Please set SIPPY_API_URL environment variable or provide sippy_api_url parameter."
+            return None, "Error: No Sippy API URL configured. Please set SIPPY_API_URL environment variable or provide sippy_api_url parameter."
 
         # Clean and validate the job ID - ensure it's just the numeric ID
-        clean_job_id = str(prow_job_run_id).strip()
-        # Extract just the numeric part if there's extra text
-        import re
-        job_id_match = re.search(r'\b(\d{10,})\b', clean_job_id)
-        if job_id_match:
-            clean_job_id = job_id_match.group(1)
-        elif not clean_job_id.isdigit():
-            return f"Error: Invalid job ID format. Expected numeric ID, got: {prow_job_run_id}"
+        job_id = clean_job_id(prow_job_run_id)
+        if not job_id:
+            return None, f"Error: Invalid job ID format. Expected numeric ID, got: {prow_job_run_id}"
 
         # Create cache key to prevent redundant calls
-        cache_key = f"{clean_job_id}:{path_glob}:{text_regex}"
+        cache_key = f"{job_id}:{path_glob}:{text_regex}"
         if cache_key in self._cache:
             logger.info(f"Returning cached result for {cache_key}")
-            return f"[CACHED RESULT]\n{self._cache[cache_key]}"
-        
+            return None, f"[CACHED RESULT]\n{self._cache[cache_key]}"
+
         # Construct the API endpoint
         endpoint = f"{api_url.rstrip('/')}/api/jobs/artifacts"
-        
-        try:
-            # Make the API request with correct parameter names
-            params = {
-                "prowJobRuns": clean_job_id,  # Just the numeric ID
-                "pathGlob": path_glob,
-                "textRegex": text_regex
-            }
-            
-            logger.info(f"Making request to {endpoint} with params: {params}")
-            
-            with httpx.Client(timeout=60.0) as client:  # Longer timeout for log analysis
-                response = client.get(endpoint, params=params)
-                response.raise_for_status()
-                
-                # The response should be JSON containing the matched artifacts
-                data = response.json()
 
-                # Format the response for better readability
-                result = format_log_analysis(data, clean_job_id, path_glob, text_regex)
+        # Query parameters use the API's names
+        params = {
+            "prowJobRuns": job_id,  # Just the numeric ID
+            "pathGlob": path_glob,
+            "textRegex": text_regex
+        }
+        return (api_url, endpoint, params, cache_key), None
 
-                # Cache the result to prevent redundant calls
-                self._cache[cache_key] = result
+    def _format_result(self, buf: bytearray, params: Dict[str, str], cache_key: str) -> str:
+        """Decode and format an artifact search response, caching the result."""
+        # The response should be JSON containing the matched artifacts
+        data = orjson.loads(buf)
 
-                return result
-                
-        except httpx.HTTPStatusError as e:
+        # Format the response for better readability
+        result = format_log_analysis(data, params["prowJobRuns"], params["pathGlob"], params["textRegex"])
+
+        # Cache the result to prevent redundant calls
+        self._cache[cache_key] = result
+
+        return result
+
+    def _handle_error(self, e: Exception, api_url: str) -> str:
+        """Convert an exception raised while searching artifacts into an error message."""
+        if isinstance(e, httpx.HTTPStatusError):
             logger.error(f"HTTP error analyzing logs: {e}")
             return f"Error: HTTP {e.response.status_code} - {e.response.text}"
-        except httpx.RequestError as e:
+        if isinstance(e, httpx.RequestError):
             logger.error(f"Request error analyzing logs: {e}")
             return f"Error: Failed to connect to Sippy API at {api_url} - {str(e)}"
-        except json.JSONDecodeError as e:
+        if isinstance(e, orjson.JSONDecodeError):
             logger.error(f"JSON decode error: {e}")
             return f"Error: Invalid JSON response from Sippy API"
-        except Exception as e:
-            logger.error(f"Unexpected error analyzing logs: {e}")
-            return f"Error: Unexpected error - {str(e)}"
+        logger.error(f"Unexpected error analyzing logs: {e}")
+        return f"Error: Unexpected error - {str(e)}"
 
     def get_aggregated_junit_url(self, prow_job_run_id: str, sippy_api_url: Optional[str] = None) -> str:
         """Get the direct URL to the junit-aggregated.xml file for an aggregated job."""
@@ -116,12 +177,8 @@ class SippyLogAnalyzerTool(SippyBaseTool):
             return "Error: No Sippy API URL configured. Please set SIPPY_API_URL environment variable or provide sippy_api_url parameter."
 
         # Clean and validate the job ID
-        clean_job_id = str(prow_job_run_id).strip()
-        import re
-        job_id_match = re.search(r'\b(\d{10,})\b', clean_job_id)
-        if job_id_match:
-            clean_job_id = job_id_match.group(1)
-        elif not clean_job_id.isdigit():
+        job_id = clean_job_id(prow_job_run_id)
+        if not job_id:
             return f"Error: Invalid job ID format. Expected numeric ID, got: {prow_job_run_id}"
 
         # Construct the API endpoint for aggregated JUnit artifacts
@@ -130,35 +187,34 @@ class SippyLogAnalyzerTool(SippyBaseTool):
         try:
             # Make the API request specifically for junit-aggregated.xml
             params = {
-                "prowJobRuns": clean_job_id,
+                "prowJobRuns": job_id,
                 "pathGlob": "artifacts/**/junit-aggregated.xml"
             }
 
             logger.info(f"Fetching aggregated JUnit URL from {endpoint} with params: {params}")
 
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(endpoint, params=params)
-                response.raise_for_status()
+            response = get_client().get(endpoint, params=params)
+            response.raise_for_status()
+
+            data = orjson.loads(response.content)
 
-                data = response.json()
-
-                # Extract the artifact URL from the response
-                if isinstance(data, dict) and "job_runs" in data:
-                    job_runs = data.get("job_runs", [])
-                    if job_runs:
-                        artifacts = job_runs[0].get("artifacts", [])
-                        if artifacts:
-                            artifact_url = artifacts[0].get("artifact_url", "")
-                            if artifact_url:
-                                return f"**Aggregated JUnit XML URL Found:**\n{artifact_url}\n\nUse the JUnit parser tool with this URL to analyze the aggregated test results."
-                            else:
-                                return "Error: No artifact URL found in the response."
+            # Extract the artifact URL from the response
+            if isinstance(data, dict) and "job_runs" in data:
+                job_runs = data.get("job_runs", [])
+                if job_runs:
+                    artifacts = job_runs[0].get("artifacts", [])
+                    if artifacts:
+                        artifact_url = artifacts[0].get("artifact_url", "")
+                        if artifact_url:
+                            return f"**Aggregated JUnit XML URL Found:**\n{artifact_url}\n\nUse the JUnit parser tool with this URL to analyze the aggregated test results."
                         else:
-                            return "Error: No junit-aggregated.xml artifacts found for this job."
+                            return "Error: No artifact URL found in the response."
                     else:
-                        return "Error: No job runs found in the response."
+                        return "Error: No junit-aggregated.xml artifacts found for this job."
                 else:
-                    return "Error: Unexpected response format from Sippy API."
+                    return "Error: No job runs found in the response."
+            else:
+                return "Error: Unexpected response format from Sippy API."
 
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error fetching aggregated JUnit URL: {e}")
@@ -2,17 +2,23 @@
 Tool for getting OpenShift release information from Sippy API.
 """
 
-import json
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Type
+from functools import cached_property, lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Type
 from pydantic import Field
 import httpx
+import orjson
 
 from .base_tool import SippyBaseTool, SippyToolInput
+from .http_helpers import ETagCache, conditional_headers, get_async_client, get_client
 
 logger = logging.getLogger(__name__)
 
+# Release data changes on the order of hours, so reuse it for a few minutes
+_RELEASES_TTL = 300.0
+_releases_cache = ETagCache(maxsize=8, ttl=_RELEASES_TTL)
+
 
 class SippyReleasesTool(SippyBaseTool):
     """Tool for getting OpenShift release information from Sippy API."""
@@ -28,38 +34,105 @@ class SippyReleasesTool(SippyBaseTool):
 
     args_schema: Type[SippyToolInput] = ReleasesInput
 
+    @cached_property
+    def _endpoint(self) -> Optional[str]:
+        """The /api/releases endpoint, built once from sippy_api_url."""
+        if not self.sippy_api_url:
+            return None
+        return f"{self.sippy_api_url.rstrip('/')}/api/releases"
+
     def _run(self, *args, **kwargs: Any) -> str:
         """Get release information from Sippy API."""
-        if not self.sippy_api_url:
-            return "Error: No Sippy API URL configured. Please set SIPPY_API_URL environment variable."
-        
-        # Construct the API endpoint
-        endpoint = f"{self.sippy_api_url.rstrip('/')}/api/releases"
-        
         try:
+            request, early_result = self._prepare_request()
+            if early_result:
+                return early_result
+            endpoint, cached = request
+
             logger.info(f"Making request to {endpoint}")
             
-            with httpx.Client(timeout=30.0) as client:
-                response = client.get(endpoint)
-                response.raise_for_status()
-                
-                data = response.json()
-
-                # Always return all releases data
-                return self._format_all_releases_response(data)
-                
-        except httpx.HTTPStatusError as e:
+            response = get_client().get(endpoint, headers=conditional_headers(cached))
+            return self._format_response(endpoint, response, cached)
+            
+        except Exception as e:
+            return self._handle_error(e)
+
+    async def _arun(self, *args, **kwargs: Any) -> str:
+        """Async version of _run using the shared async HTTP client."""
+        try:
+            request, early_result = self._prepare_request()
+            if early_result:
+                return early_result
+            endpoint, cached = request
+
+            logger.info(f"Making async request to {endpoint}")
+
+            response = await get_async_client().get(endpoint, headers=conditional_headers(cached))
+            return self._format_response(endpoint, response, cached)
+
+        except Exception as e:
+            return self._handle_error(e)
+
+    def _prepare_request(
+        self
+    ) -> Tuple[Optional[Tuple[str, Optional[Tuple[Optional[str], Any, float]]]], Optional[str]]:
+        """Look up the release data shared by _run and _arun, returning (request, early_result).
+
+        The request is (endpoint, cached entry). The early result is an error
+        message, or the formatted cached data while it is still fresh.
+        """
+        endpoint = self._endpoint
+        if not endpoint:
+            return None, "Error: No Sippy API URL configured. Please set SIPPY_API_URL environment variable."
+
+        cached = _releases_cache.lookup(endpoint)
+        if _releases_cache.fresh(cached):
+            logger.info(f"Using cached release data for {endpoint}")
+            return None, self._format_all_releases_response(cached[1])
+
+        return (endpoint, cached), None
+
+    def _format_response(
+        self,
+        endpoint: str,
+        response: httpx.Response,
+        cached: Optional[Tuple[Optional[str], Any, float]]
+    ) -> str:
+        """Read the release data from the response and format it for display."""
+        data = self._read_response(endpoint, response, cached)
+
+        # Always return all releases data
+        return self._format_all_releases_response(data)
+
+    def _read_response(
+        self,
+        endpoint: str,
+        response: httpx.Response,
+        cached: Optional[Tuple[Optional[str], Any, float]]
+    ) -> Dict[str, Any]:
+        """Return the release data, reusing the cached copy on 304 Not Modified."""
+        if cached and response.status_code == 304:
+            _releases_cache.refresh(endpoint, cached)
+            return cached[1]
+        response.raise_for_status()
+
+        data = self._normalize_dates(orjson.loads(response.content))
+        _releases_cache.store(endpoint, response, data)
+        return data
+
+    def _handle_error(self, e: Exception) -> str:
+        """Convert an exception raised while fetching release info into an error message."""
+        if isinstance(e, httpx.HTTPStatusError):
             logger.error(f"HTTP error getting release info: {e}")
             return f"Error: HTTP {e.response.status_code} - {e.response.text}"
-        except httpx.RequestError as e:
+        if isinstance(e, httpx.RequestError):
             logger.error(f"Request error getting release info: {e}")
             return f"Error: Failed to connect to Sippy API at {self.sippy_api_url} - {str(e)}"
-        except json.JSONDecodeError as e:
+        if isinstance(e, orjson.JSONDecodeError):
             logger.error(f"JSON decode error: {e}")
             return f"Error: Invalid JSON response from Sippy API"
-        except Exception as e:
-            logger.error(f"Unexpected error getting release info: {e}")
-            return f"Error: Unexpected error - {str(e)}"
+        logger.error(f"Unexpected error getting release info: {e}")
+        return f"Error: Unexpected error - {str(e)}"
     
     def _format_all_releases_response(self, data: Dict[str, Any]) -> str:
         """Format the release response data showing all releases."""
@@ -88,43 +161,76 @@ class SippyReleasesTool(SippyBaseTool):
         last_updated: str
     ) -> str:
         """Format response showing all releases."""
-        result = f"**📋 All OpenShift Releases**\n\n"
-        result += f"**Total Releases:** {len(releases)}\n"
+        parts = [
+            f"**📋 All OpenShift Releases**\n\n",
+            f"**Total Releases:** {len(releases)}\n",
+        ]
         
         if last_updated:
-            formatted_updated = self._format_date(last_updated)
-            result += f"**Last Updated:** {formatted_updated}\n"
+            parts.append(f"**Last Updated:** {last_updated}\n")
         
-        result += f"\n**Release List:**\n"
+        parts.append(f"\n**Release List:**\n")
         
         for i, release in enumerate(releases, 1):
             ga_date = ga_dates.get(release)
-            status_emoji = "✅" if ga_date else "🚧"
-            status_text = "GA" if ga_date else "Dev"
-            
-            result += f"{i:2d}. **{release}** {status_emoji} {status_text}"
             
             if ga_date:
-                formatted_ga = self._format_date(ga_date)
-                result += f" (GA: {formatted_ga})"
+                parts.append(f"{i:2d}. **{release}** ✅ GA (GA: {ga_date})\n")
+                continue
+
+            # Show dev start if available
+            release_dates = dates.get(release, {})
+            dev_start = release_dates.get("development_start")
+            if dev_start:
+                parts.append(f"{i:2d}. **{release}** 🚧 Dev (Dev: {dev_start})\n")
             else:
-                # Show dev start if available
-                release_dates = dates.get(release, {})
-                dev_start = release_dates.get("development_start")
-                if dev_start:
-                    formatted_dev = self._format_date(dev_start)
-                    result += f" (Dev: {formatted_dev})"
-            
-            result += "\n"
+                parts.append(f"{i:2d}. **{release}** 🚧 Dev\n")
         
-        return result
+        return "".join(parts)
+
+    def _normalize_dates(self, data: Any) -> Any:
+        """Format every date in a releases response once, in place, so cached data is ready to display."""
+        if not isinstance(data, dict):
+            return data
+
+        ga_dates = data.get("ga_dates")
+        if isinstance(ga_dates, dict):
+            for release, date_str in ga_dates.items():
+                if isinstance(date_str, str):
+                    ga_dates[release] = self._format_date(date_str)
+
+        dates = data.get("dates")
+        if isinstance(dates, dict):
+            for release_dates in dates.values():
+                if isinstance(release_dates, dict):
+                    for key, date_str in release_dates.items():
+                        if isinstance(date_str, str):
+                            release_dates[key] = self._format_date(date_str)
+
+        last_updated = data.get("last_updated")
+        if isinstance(last_updated, str) and last_updated:
+            data["last_updated"] = self._format_date(last_updated)
+
+        return data
 
     def _format_date(self, date_str: str) -> str:
         """Format ISO date string to readable format."""
-        try:
-            # Parse ISO format date
-            dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
-            return dt.strftime('%Y-%m-%d')
-        except Exception:
-            # Return original if parsing fails
-            return date_str
+        return _format_iso_date(date_str)
+
+
+@lru_cache(maxsize=512)
+def _format_iso_date(date_str: str) -> str:
+    """Format ISO date string to readable format, memoized since GA dates repeat across calls."""
+    # ISO timestamps already start with the YYYY-MM-DD we want to show
+    if (len(date_str) >= 10 and date_str[4] == '-' and date_str[7] == '-'
+            and date_str[:4].isdigit() and date_str[5:7].isdigit() and date_str[8:10].isdigit()
+            and (len(date_str) == 10 or date_str[10] in 'T ')):
+        return date_str[:10]
+
+    try:
+        # Parse ISO format date
+        dt = datetime.fromisoformat(date_str.replace('Z', '+00:00'))
+        return dt.strftime('%Y-%m-%d')
+    except Exception:
+        # Return original if parsing fails
+        return date_str
@@ -2,7 +2,46 @@
 Helper functions for analyzing test failures.
 """
 
-from typing import Dict
+import re
+from collections import Counter
+from typing import Dict, Optional
+
+_SIG_RE = re.compile(r'\[sig-([^\]]+)\]')
+_FEATURE_RE = re.compile(r'\[Feature:([^\]]+)\]')
+_SUITE_RE = re.compile(r'\[Suite:([^\]]+)\]')
+
+# Common error patterns, most relevant first
+_ERROR_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r'Error: ([^\\n]+)',
+        r'error: ([^\\n]+)',
+        r'FAIL: ([^\\n]+)',
+        r'failed: ([^\\n]+)',
+        r'Expected[^,]+, got ([^\\n]+)',
+        r'timeout: ([^\\n]+)',
+    )
+]
+
+# Failure message substrings and the error pattern they indicate, checked in order
+_ERROR_CATEGORIES = (
+    (("timeout", "timed out"), "timeout"),
+    (("connection", "network"), "network"),
+    (("permission", "forbidden"), "permissions"),
+    (("not found", "404"), "missing_resources"),
+)
+
+
+def classify_failure_message(failure_msg: str) -> Optional[str]:
+    """Return the first common error pattern a failure message matches, if any."""
+    failure_lower = failure_msg.lower()
+    for needles, label in _ERROR_CATEGORIES:
+        for needle in needles:
+            if needle in failure_lower:
+                return label
+    if "pod" in failure_lower and ("crash" in failure_lower or "failed" in failure_lower):
+        return "pod_failures"
+    return None
 
 
 def analyze_test_failures(test_failures: Dict[str, str]) -> str:
@@ -11,41 +50,33 @@ def analyze_test_failures(test_failures: Dict[str, str]) -> str:
         return ""
     
     # Categorize tests by their sig (special interest group)
-    categories = {}
-    error_patterns = {}
+    categories = Counter()
+    error_patterns = Counter()
     
     for test_name, failure_msg in test_failures.items():
         # Extract category from test name
         category = extract_test_category(test_name)
         if category:
-            categories[category] = categories.get(category, 0) + 1
+            categories[category] += 1
         
         # Look for common error patterns
-        failure_lower = failure_msg.lower()
-        if "timeout" in failure_lower or "timed out" in failure_lower:
-            error_patterns["timeout"] = error_patterns.get("timeout", 0) + 1
-        elif "connection" in failure_lower or "network" in failure_lower:
-            error_patterns["network"] = error_patterns.get("network", 0) + 1
-        elif "permission" in failure_lower or "forbidden" in failure_lower:
-            error_patterns["permissions"] = error_patterns.get("permissions", 0) + 1
-        elif "not found" in failure_lower or "404" in failure_lower:
-            error_patterns["missing_resources"] = error_patterns.get("missing_resources", 0) + 1
-        elif "pod" in failure_lower and ("crash" in failure_lower or "failed" in failure_lower):
-            error_patterns["pod_failures"] = error_patterns.get("pod_failures", 0) + 1
+        label = classify_failure_message(failure_msg)
+        if label:
+            error_patterns[label] += 1
     
     analysis = ""
     
     # Analyze by category
     if categories:
         analysis += "**Test Categories Affected:**\n"
-        for category, count in sorted(categories.items(), key=lambda x: x[1], reverse=True):
+        for category, count in categories.most_common():
             analysis += f"- {category}: {count} test(s)\n"
         analysis += "\n"
     
     # Analyze by error patterns
     if error_patterns:
         analysis += "**Common Error Patterns:**\n"
-        for pattern, count in sorted(error_patterns.items(), key=lambda x: x[1], reverse=True):
+        for pattern, count in error_patterns.most_common():
             analysis += f"- {pattern.replace('_', ' ').title()}: {count} occurrence(s)\n"
         analysis += "\n"
     
@@ -59,21 +90,19 @@ def analyze_test_failures(test_failures: Dict[str, str]) -> str:
 
 def extract_test_category(test_name: str) -> str:
     """Extract the test category/sig from test name."""
-    import re
-    
     # Look for [sig-xxx] pattern
-    sig_match = re.search(r'\[sig-([^\]]+)\]', test_name)
+    sig_match = _SIG_RE.search(test_name)
     if sig_match:
         return f"sig-{sig_match.group(1)}"
     
     # Look for other common patterns
     if "[Feature:" in test_name:
-        feature_match = re.search(r'\[Feature:([^\]]+)\]', test_name)
+        feature_match = _FEATURE_RE.search(test_name)
         if feature_match:
             return f"Feature: {feature_match.group(1)}"
     
     if "[Suite:" in test_name:
-        suite_match = re.search(r'\[Suite:([^\]]+)\]', test_name)
+        suite_match = _SUITE_RE.search(test_name)
         if suite_match:
             return f"Suite: {suite_match.group(1)}"
     
@@ -88,21 +117,9 @@ def clean_failure_message(failure_msg: str) -> str:
     # Remove excessive whitespace and newlines
     clean_msg = ' '.join(failure_msg.split())
     
-    # Extract key error information
-    import re
-    
     # Look for common error patterns and extract the most relevant part
-    error_patterns = [
-        r'Error: ([^\\n]+)',
-        r'error: ([^\\n]+)',
-        r'FAIL: ([^\\n]+)',
-        r'failed: ([^\\n]+)',
-        r'Expected[^,]+, got ([^\\n]+)',
-        r'timeout: ([^\\n]+)',
-    ]
-    
-    for pattern in error_patterns:
-        match = re.search(pattern, clean_msg, re.IGNORECASE)
+    for pattern in _ERROR_PATTERNS:
+        match = pattern.search(clean_msg)
         if match:
             key_error = match.group(1).strip()
             if len(key_error) < 150:
@@ -3,17 +3,23 @@ FastAPI web server for Sippy Agent.
 """
 
 import asyncio
-import json
+import hashlib
 import logging
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set, Union
+import anyio
+import orjson
 import uvicorn
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel
 
-from .agent import SippyAgent
-from .config import Config
+from .agent import CHAT_ERROR_PREFIX, SippyAgent
+from .config import Config, SHOW_THINKING
+from .tools.http_helpers import aclose_async_client
 from .api_models import (
     ChatRequest, ChatResponse, ChatMessage, ThinkingStep,
     StreamMessage, AgentStatus, HealthResponse
@@ -21,27 +27,78 @@ from .api_models import (
 
 logger = logging.getLogger(__name__)
 
+# Server settings shared by reload and non-reload mode. uvicorn[standard]
+# installs uvloop and httptools and uvicorn selects them automatically; keep
+# idle HTTP connections open longer than the 5s default so clients polling
+# /status or /health reuse them.
+_UVICORN_OPTIONS: Dict[str, Any] = {
+    "log_level": "info",
+    "timeout_keep_alive": 30,
+    # Chat requests are small; close connections sending frames over 1 MiB
+    # instead of buffering and parsing them (uvicorn's default is 16 MiB)
+    "ws_max_size": 1024 * 1024,
+}
+
+# Number of /chat results kept for requests that set cacheable
+_RESULT_CACHE_SIZE = 128
+
+# Thinking events buffered per WebSocket reply before the agent waits for the client
+_STREAM_BUFFER_SIZE = 64
+
+# Pseudo-actions LangChain records for parse errors; never real tools.
+# The empty string covers steps without an action.
+_INVALID_ACTIONS = frozenset({"", "_Exception", "Invalid", "Error"})
+
+# Prefixes used when flattening chat history into the agent's context
+_ROLE_PREFIX = {"user": "User: ", "assistant": "Assistant: "}
+
+
+def _format_history(messages: List[Union[ChatMessage, Dict[str, Any]]]) -> str:
+    """Format the last 3 chat messages as a context string for the agent."""
+    parts = []
+    for msg in messages[-3:]:
+        if isinstance(msg, dict):
+            role, content = msg.get("role"), msg.get("content", "")
+        else:
+            role, content = msg.role, msg.content
+        prefix = _ROLE_PREFIX.get(role)
+        if prefix is not None:
+            parts.append(f"{prefix}{content}")
+    return "\n".join(parts)
+
+
+@asynccontextmanager
+async def _lifespan(app: FastAPI):
+    """Close the tools' async HTTP client when the server shuts down."""
+    yield
+    await aclose_async_client()
+
+
+def _json_response(model: BaseModel) -> Response:
+    """Serialize a model directly, skipping FastAPI's response_model revalidation.
+
+    Routes keep their response_model so the OpenAPI schema is unchanged.
+    """
+    return Response(content=model.model_dump_json(), media_type="application/json")
+
 
 class WebSocketManager:
     """Manages WebSocket connections for streaming chat."""
     
     def __init__(self):
-        self.active_connections: List[WebSocket] = []
+        self.active_connections: Set[WebSocket] = set()
     
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
+        self.active_connections.add(websocket)
     
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
+        self.active_connections.discard(websocket)
     
     async def send_message(self, websocket: WebSocket, message: StreamMessage):
-        try:
-            await websocket.send_text(message.model_dump_json())
-        except Exception as e:
-            logger.error(f"Error sending WebSocket message: {e}")
-            self.disconnect(websocket)
+        # Send errors propagate so the connection handler stops reading from
+        # the socket and disconnects it exactly once
+        await websocket.send_text(message.model_dump_json())
 
 
 class SippyWebServer:
@@ -53,9 +110,11 @@ class SippyWebServer:
         self.app = FastAPI(
             title="Sippy AI Agent API",
             description="REST API for Sippy CI/CD Analysis Agent",
-            version="1.0.0"
+            version="1.0.0",
+            lifespan=_lifespan
         )
         self.websocket_manager = WebSocketManager()
+        self._result_cache: "OrderedDict[bytes, Any]" = OrderedDict()
         self._setup_middleware()
         self._setup_routes()
     
@@ -63,58 +122,63 @@ class SippyWebServer:
         """Setup CORS and other middleware."""
         self.app.add_middleware(
             CORSMiddleware,
-            allow_origins=["*"],  # Configure this for production
+            allow_origins=self.config.cors_origins,  # Set CORS_ORIGINS for production
             allow_credentials=True,
-            allow_methods=["*"],
-            allow_headers=["*"],
+            allow_methods=["GET", "POST"],
+            allow_headers=["Content-Type", "Authorization"],
         )
     
     def _setup_routes(self):
         """Setup API routes."""
         
+        # Health and status don't change once the server is set up, so
+        # serialize them once
+        health_response = _json_response(HealthResponse(
+            status="healthy",
+            version="1.0.0",
+            agent_ready=True
+        ))
+        status_response = _json_response(AgentStatus(
+            available_tools=self.agent.list_tools(),
+            model_name=self.config.model_name,
+            endpoint=self.config.llm_endpoint,
+            thinking_enabled=self.config.show_thinking
+        ))
+
         @self.app.get("/health", response_model=HealthResponse)
         async def health_check():
             """Health check endpoint."""
-            return HealthResponse(
-                status="healthy",
-                version="1.0.0",
-                agent_ready=True
-            )
+            return health_response
         
         @self.app.get("/status", response_model=AgentStatus)
         async def get_agent_status():
             """Get agent status and configuration."""
-            return AgentStatus(
-                available_tools=self.agent.list_tools(),
-                model_name=self.config.model_name,
-                endpoint=self.config.llm_endpoint,
-                thinking_enabled=self.config.show_thinking
-            )
+            return status_response
         
         @self.app.post("/chat", response_model=ChatResponse)
         async def chat(request: ChatRequest):
             """Process a chat message and return the response."""
             try:
-                # Convert chat history to context string
-                chat_history_context = ""
-                if request.chat_history:
-                    history_parts = []
-                    for msg in request.chat_history[-3:]:  # Last 3 exchanges
-                        if msg.role == "user":
-                            history_parts.append(f"User: {msg.content}")
-                        elif msg.role == "assistant":
-                            history_parts.append(f"Assistant: {msg.content}")
-                    chat_history_context = "\n".join(history_parts)
+                # Convert chat history to context string, unless the client sent one
+                chat_history_context = request.chat_history_context
+                if chat_history_context is None:
+                    chat_history_context = _format_history(request.chat_history or [])
                 
-                # Override thinking setting if provided
-                original_thinking = self.config.show_thinking
-                if request.show_thinking is not None:
-                    self.config.show_thinking = request.show_thinking
-                    self.agent.config.show_thinking = request.show_thinking
+                # Override thinking setting for this request only
+                token = SHOW_THINKING.set(request.show_thinking)
                 
                 try:
-                    # Process the message
-                    result = self.agent.chat(request.message, chat_history_context)
+                    cache_key = None
+                    result = None
+                    if request.cacheable:
+                        cache_key = self._result_cache_key(request.message, chat_history_context)
+                        result = self._get_cached_result(cache_key)
+
+                    if result is None:
+                        # Process the message off the event loop
+                        result = await asyncio.to_thread(self.agent.chat, request.message, chat_history_context)
+                        if cache_key is not None:
+                            self._store_result(cache_key, result)
                     
                     if isinstance(result, dict) and "thinking_steps" in result:
                         # Convert thinking steps to API format
@@ -128,29 +192,27 @@ class SippyWebServer:
                                 observation=step.get("observation", "")
                             ))
                         
-                        return ChatResponse(
+                        return _json_response(ChatResponse(
                             response=result["output"],
                             thinking_steps=thinking_steps,
                             tools_used=self._extract_tools_used(result["thinking_steps"])
-                        )
+                        ))
                     else:
-                        return ChatResponse(
+                        return _json_response(ChatResponse(
                             response=result,
                             thinking_steps=None,
                             tools_used=None
-                        )
+                        ))
                 
                 finally:
-                    # Restore original thinking setting
-                    self.config.show_thinking = original_thinking
-                    self.agent.config.show_thinking = original_thinking
+                    SHOW_THINKING.reset(token)
                 
             except Exception as e:
                 logger.error(f"Error processing chat request: {e}")
-                return ChatResponse(
+                return _json_response(ChatResponse(
                     response="I encountered an error while processing your request.",
                     error=str(e)
-                )
+                ))
         
         @self.app.websocket("/chat/stream")
         async def websocket_chat(websocket: WebSocket):
@@ -161,55 +223,36 @@ class SippyWebServer:
                 while True:
                     # Receive message from client
                     data = await websocket.receive_text()
-                    request_data = json.loads(data)
+                    try:
+                        request_data = orjson.loads(data)
+                    except orjson.JSONDecodeError as e:
+                        request_data = None
+                        logger.warning(f"Invalid WebSocket message: {e}")
+                    if not isinstance(request_data, dict):
+                        await self.websocket_manager.send_message(websocket, StreamMessage(
+                            type="error",
+                            data={
+                                "error": "Invalid message: expected a JSON object",
+                                "timestamp": datetime.now().isoformat()
+                            }
+                        ))
+                        continue
                     
                     # Parse request
                     message = request_data.get("message", "")
-                    chat_history = request_data.get("chat_history", [])
                     show_thinking = request_data.get("show_thinking", self.config.show_thinking)
                     
-                    # Convert chat history to context
-                    chat_history_context = ""
-                    if chat_history:
-                        history_parts = []
-                        for msg in chat_history[-3:]:
-                            if msg.get("role") == "user":
-                                history_parts.append(f"User: {msg.get('content', '')}")
-                            elif msg.get("role") == "assistant":
-                                history_parts.append(f"Assistant: {msg.get('content', '')}")
-                        chat_history_context = "\n".join(history_parts)
+                    # Convert chat history to context, unless the client sent one
+                    chat_history_context = request_data.get("chat_history_context")
+                    if not isinstance(chat_history_context, str):
+                        chat_history_context = _format_history(request_data.get("chat_history") or [])
                     
-                    # For WebSocket, we'll disable the streaming callback and just send the final result
-                    # The real-time streaming is complex to implement correctly with the current agent architecture
-
-                    # Override thinking setting
-                    original_thinking = self.config.show_thinking
-                    self.config.show_thinking = show_thinking
-                    self.agent.config.show_thinking = show_thinking
+                    # Override thinking setting for this message only
+                    token = SHOW_THINKING.set(show_thinking)
 
                     try:
-                        # Process message (without streaming for now)
-                        result = self.agent.chat(message, chat_history_context)
-
-                        # If thinking was enabled, send thinking steps first
-                        if show_thinking and isinstance(result, dict) and "thinking_steps" in result:
-                            thinking_steps = result.get("thinking_steps", [])
-
-                            # Send each thinking step
-                            for i, step in enumerate(thinking_steps, 1):
-                                await self.websocket_manager.send_message(websocket, StreamMessage(
-                                    type="thinking_step",
-                                    data={
-                                        "step_number": i,
-                                        "thought": step.get("thought", ""),
-                                        "action": step.get("action", ""),
-                                        "action_input": step.get("action_input", ""),
-                                        "observation": step.get("observation", ""),
-                                        "complete": True
-                                    }
-                                ))
-                                # Small delay between steps for better UX
-                                await asyncio.sleep(0.1)
+                        # Run the agent, streaming thinking steps to the client as they happen
+                        result = await self._stream_chat(websocket, message, chat_history_context, show_thinking)
 
                         # Send final response
                         if isinstance(result, dict) and "output" in result:
@@ -228,6 +271,8 @@ class SippyWebServer:
                             }
                         ))
                     
+                    except WebSocketDisconnect:
+                        raise
                     except Exception as e:
                         logger.error(f"Error in WebSocket chat: {e}")
                         await self.websocket_manager.send_message(websocket, StreamMessage(
@@ -239,24 +284,116 @@ class SippyWebServer:
                         ))
                     
                     finally:
-                        # Restore original thinking setting
-                        self.config.show_thinking = original_thinking
-                        self.agent.config.show_thinking = original_thinking
+                        SHOW_THINKING.reset(token)
             
             except WebSocketDisconnect:
-                self.websocket_manager.disconnect(websocket)
+                pass
             except Exception as e:
                 logger.error(f"WebSocket error: {e}")
+            finally:
                 self.websocket_manager.disconnect(websocket)
     
+    async def _stream_chat(self, websocket: WebSocket, message: str, chat_history_context: str,
+                           show_thinking: bool) -> Any:
+        """Run the agent in a worker thread, sending thinking steps over the WebSocket as they arrive."""
+        # Bounded so a slow client pauses the agent rather than piling up steps
+        send_stream, receive_stream = anyio.create_memory_object_stream(_STREAM_BUFFER_SIZE)
+        result = None
+
+        def thinking_callback(thought: str, action: str, action_input: str, observation: str) -> None:
+            # Called from the agent's worker thread; blocks while the buffer is full
+            anyio.from_thread.run(send_stream.send, (thought, action, action_input, observation))
+
+        async def run_agent() -> None:
+            nonlocal result
+            async with send_stream:
+                # The agent can't be interrupted mid-run; on disconnect, stop waiting for it
+                result = await anyio.to_thread.run_sync(
+                    self.agent.chat, message, chat_history_context,
+                    thinking_callback if show_thinking else None,
+                    abandon_on_cancel=True
+                )
+
+        step: Optional[Dict[str, Any]] = None
+        step_number = 0
+        completed: Set[int] = set()
+        try:
+            async with anyio.create_task_group() as task_group:
+                task_group.start_soon(run_agent)
+
+                async with receive_stream:
+                    async for thought, action, action_input, observation in receive_stream:
+                        if action:
+                            # New step starting
+                            step_number += 1
+                            step = {
+                                "step_number": step_number,
+                                "thought": thought,
+                                "action": action,
+                                "action_input": action_input,
+                                "observation": "",
+                                "complete": False
+                            }
+                        elif observation and step is not None:
+                            # Tool finished for the current step
+                            step = {**step, "observation": observation, "complete": True}
+                            completed.add(step_number)
+                        else:
+                            continue
+                        await self.websocket_manager.send_message(
+                            websocket, StreamMessage(type="thinking_step", data=step)
+                        )
+        except ExceptionGroup as eg:
+            # Re-raise the underlying error (e.g. WebSocketDisconnect) for the caller
+            raise eg.exceptions[0] from None
+
+        # Steps whose tool output never reached the stream (tool errors are
+        # filtered out by the handler) are completed from the parsed run
+        if show_thinking and isinstance(result, dict):
+            for i, parsed in enumerate(result.get("thinking_steps", []), 1):
+                if i not in completed:
+                    await self.websocket_manager.send_message(websocket, StreamMessage(
+                        type="thinking_step",
+                        data={
+                            "step_number": i,
+                            "thought": parsed.get("thought", ""),
+                            "action": parsed.get("action", ""),
+                            "action_input": parsed.get("action_input", ""),
+                            "observation": parsed.get("observation", ""),
+                            "complete": True
+                        }
+                    ))
+
+        return result
+
+    def _result_cache_key(self, message: str, chat_history_context: str) -> bytes:
+        """Hash the inputs that determine a chat result."""
+        key = f"{self.config.thinking_enabled()}\x00{message}\x00{chat_history_context}"
+        return hashlib.blake2b(key.encode(), digest_size=16).digest()
+
+    def _get_cached_result(self, key: bytes) -> Any:
+        """Return a cached chat result, or None."""
+        result = self._result_cache.get(key)
+        if result is not None:
+            self._result_cache.move_to_end(key)
+        return result
+
+    def _store_result(self, key: bytes, result: Any) -> None:
+        """Cache a chat result, evicting the oldest entries past _RESULT_CACHE_SIZE."""
+        output = result.get("output", "") if isinstance(result, dict) else result
+        if isinstance(output, str) and output.startswith(CHAT_ERROR_PREFIX):
+            # Don't keep serving a transient failure
+            return
+        self._result_cache[key] = result
+        while len(self._result_cache) > _RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
+
     def _extract_tools_used(self, thinking_steps: List[Dict[str, Any]]) -> List[str]:
         """Extract unique tool names from thinking steps."""
-        tools = set()
-        for step in thinking_steps:
-            action = step.get("action", "")
-            if action and action not in ["_Exception", "Invalid", "Error"]:
-                tools.add(action)
-        return list(tools)
+        return list({
+            action for step in thinking_steps
+            if (action := step.get("action", "")) not in _INVALID_ACTIONS
+        })
     
     def run(self, host: str = "0.0.0.0", port: int = 8000, reload: bool = False):
         """Run the web server."""
@@ -267,7 +404,7 @@ class SippyWebServer:
                 host=host,
                 port=port,
                 reload=reload,
-                log_level="info"
+                **_UVICORN_OPTIONS
             )
         else:
             # For non-reload mode, use the app instance directly
@@ -275,23 +412,27 @@ class SippyWebServer:
                 self.app,
                 host=host,
                 port=port,
-                log_level="info"
+                **_UVICORN_OPTIONS
             )
 
 
 # Global app instance for uvicorn - initialized lazily
-app = None
+_app: Optional[FastAPI] = None
 
 
 def get_app() -> FastAPI:
     """Get or create the FastAPI app instance."""
-    global app
-    if app is None:
+    global _app
+    if _app is None:
         config = Config.from_env()
         server = SippyWebServer(config)
-        app = server.app
-    return app
+        _app = server.app
+    return _app
 
 
-# Initialize the app for uvicorn
-app = get_app()
+def __getattr__(name: str) -> Any:
+    # uvicorn/gunicorn load "sippy_agent.web_server:app"; build it on that first
+    # access instead of at import, which web_main.py doesn't need
+    if name == "app":
+        return get_app()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -7,16 +7,16 @@ import logging
 import sys
 import click
 from rich.console import Console
-from rich.logging import RichHandler
 
 from sippy_agent.config import Config
-from sippy_agent.web_server import SippyWebServer
 
 console = Console()
 
 
 def setup_logging(verbose: bool = False) -> None:
     """Setup logging with Rich handler."""
+    from rich.logging import RichHandler
+
     level = logging.DEBUG if verbose else logging.INFO
     logging.basicConfig(
         level=level,
@@ -72,6 +72,9 @@ def main(host: str, port: int, reload: bool, verbose: bool, thinking: bool,
         console.print(f"[dim]Thinking enabled: {config.show_thinking}[/dim]")
         console.print()
         
+        # Imported here so `--help` doesn't load FastAPI, uvicorn and the agent
+        from sippy_agent.web_server import SippyWebServer
+
         server = SippyWebServer(config)
         server.run(host=host, port=port, reload=reload)
         